@@ -4,7 +4,6 @@
 # Note: To use the 'upload' functionality of this file, you must:
 #   $ pip install twine
 
-import glob
 import io
 import os
 import platform
@@ -28,13 +27,32 @@ REQUIRES_PYTHON = '>=3.6.0'
 
 # What packages are required for this module to be executed?
 REQUIRED = [
-    'ed25519-blake2b>=1.4', 'py-cpuinfo>=4'
+    'ed25519-blake2b>=1.4'
+]
+
+# What packages are optional?
+EXTRAS = {
+    # Solve proof-of-work on a GPU
+    'opencl': ['pyopencl'],
+    # Solve proof-of-work without the C extensions
+    'numba': ['numba'],
+}
+
+
+# Flags for optimizing the PoW extensions with GCC and Clang.
+# '-fvisibility=hidden' isn't used since PyMODINIT_FUNC only marks the module
+# init function as exported on Python 3.9 and newer. '-march=native' is never
+# used so that the built extensions remain portable.
+UNIX_OPTIMIZATION_FLAGS = [
+    "-O3", "-flto", "-fno-plt", "-fomit-frame-pointer"
 ]
 
 
 def get_compile_args(iset=None, build_platform="x86"):
     flags = {
         "unix": {
+            "avx512f": ["-DWORK_AVX512F", "-mavx512f"],
+            "avx2": ["-DWORK_AVX2", "-mavx2"],
             "avx": ["-DWORK_AVX", "-mavx"],
             "sse4_1": ["-DWORK_SSE4_1", "-msse4.1"],
             "ssse3": ["-DWORK_SSSE3", "-mssse3"],
@@ -43,6 +61,12 @@ def get_compile_args(iset=None, build_platform="x86"):
             None: ["-DWORK_REF"]
         },
         "msvc": {
+            "avx512f": [
+                "/DWORK_AVX512F", "/arch:AVX512", "/DHAVE_AVX", "/D__SSE4_1__"
+            ],
+            "avx2": [
+                "/DWORK_AVX2", "/arch:AVX2", "/DHAVE_AVX", "/D__SSE4_1__"
+            ],
             "avx": ["/DWORK_AVX", "/arch:AVX", "/DHAVE_AVX", "/D__SSE4_1__"],
             "sse4_1": ["/DWORK_SSE4_1", "/arch:SSE2", "/D__SSE4_1__"],
             "ssse3": ["/DWORK_SSSE3", "/arch:SSE2", "/D__SSSE3__"],
@@ -57,6 +81,13 @@ def get_compile_args(iset=None, build_platform="x86"):
     if build_platform == "arm":
         flags["unix"]["neon"].append("-mfpu=neon")
 
+    # The PoW kernels are vectorized by hand. With AVX enabled, GCC
+    # otherwise vectorizes the scalar kernel across loop iterations, which
+    # halves its speed as AVX has no 64-bit rotations.
+    for unix_flags in flags["unix"].values():
+        unix_flags.append("-fno-tree-vectorize")
+        unix_flags.extend(UNIX_OPTIMIZATION_FLAGS)
+
     compiler = get_default_compiler()
 
     try:
@@ -65,14 +96,6 @@ def get_compile_args(iset=None, build_platform="x86"):
         raise OSError("Compiler '{}' not supported.".format(compiler))
 
 
-SOURCE_ROOT = os.path.join("src", "nanolib-work-module", "BLAKE2")
-SOURCE_FILES = {
-    "ref": glob.glob(os.path.join(SOURCE_ROOT, "ref", "blake2b*.c")),
-    "sse": glob.glob(os.path.join(SOURCE_ROOT, "sse", "blake2b*.c")),
-    "neon": glob.glob(os.path.join(SOURCE_ROOT, "neon", "blake2b-*.c"))
-}
-
-
 def create_work_extension(source_name="ref", iset=None, build_platform=None):
     source_path = os.path.join(
         "src", "nanolib-work-module", "BLAKE2", source_name
@@ -81,11 +104,14 @@ def create_work_extension(source_name="ref", iset=None, build_platform=None):
 
     return Extension(
         "nanolib._work_{}".format(module_suffix),
-        include_dirs=[source_path],
-        sources=[
-            os.path.join("src", "nanolib-work-module", "work.c")
-        ] + SOURCE_FILES[source_name],
-        extra_compile_args=get_compile_args(iset, build_platform)
+        include_dirs=[
+            source_path, os.path.join("src", "nanolib-work-module")
+        ],
+        # The PoW kernels only need the load/store helpers from the BLAKE2
+        # headers, so none of the BLAKE2 sources are compiled
+        sources=[os.path.join("src", "nanolib-work-module", "work.c")],
+        extra_compile_args=get_compile_args(iset, build_platform),
+        extra_link_args=["-flto"] if _is_unix_compiler else None
     )
 
 
@@ -104,6 +130,8 @@ _is_x86 = _machine.startswith("x86") or _machine in ("i386", "i686", "AMD64")
 
 if _is_x86:
     EXTENSIONS_TO_BUILD = [
+        create_work_extension("sse", "avx512f", "x86"),
+        create_work_extension("sse", "avx2", "x86"),
         create_work_extension("sse", "avx", "x86"),
         create_work_extension("sse", "sse4_1", "x86"),
         create_work_extension("sse", "ssse3", "x86"),
@@ -123,13 +151,19 @@ elif _is_aarch64:
 else:
     EXTENSIONS_TO_BUILD = [create_work_extension("ref")]
 
+EXTENSIONS_TO_BUILD.append(
+    Extension(
+        "nanolib._cpuid",
+        sources=[os.path.join("src", "nanolib-cpuid-module", "cpuid.c")]
+    )
+)
+
 EXTENSIONS_TO_BUILD.append(
     Extension(
         "nanolib._nbase32",
         include_dirs=[os.path.join("src", "nanolib-nbase32-module")],
         sources=[
-            os.path.join("src", "nanolib-nbase32-module", "nbase32.c"),
-            os.path.join("src", "nanolib-nbase32-module", "bit_array.c")
+            os.path.join("src", "nanolib-nbase32-module", "nbase32.c")
         ],
         # Older GCC versions require that we specify the C spec explicitly
         extra_compile_args=["-std=c99"] if _is_unix_compiler else None
@@ -247,6 +281,7 @@ setup(
     package_data={"": ["LICENSE"]},
     package_dir={"nanolib": "src/nanolib"},
     install_requires=REQUIRED,
+    extras_require=EXTRAS,
     setup_requires=["sphinx"],
     tests_require=["pytest"],
     include_package_data=True,
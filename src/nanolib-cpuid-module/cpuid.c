@@ -0,0 +1,148 @@
+#define PY_SSIZE_T_CLEAN 1
+#include "Python.h"
+
+#include <stdint.h>
+
+#if defined(__x86_64__) || defined(__i386__) || defined(_M_X64) || defined(_M_IX86)
+#define CPUID_X86 1
+#endif
+
+#if defined(__arm__) && defined(__linux__)
+#include <sys/auxv.h>
+
+#ifndef HWCAP_NEON
+#define HWCAP_NEON (1 << 12)
+#endif
+#endif
+
+#ifdef CPUID_X86
+#ifdef _MSC_VER
+#include <intrin.h>
+#else
+#include <cpuid.h>
+#endif
+
+static void cpuid(uint32_t leaf, uint32_t subleaf, uint32_t regs[4]) {
+#ifdef _MSC_VER
+    int info[4];
+    __cpuidex(info, (int)leaf, (int)subleaf);
+    regs[0] = (uint32_t)info[0];
+    regs[1] = (uint32_t)info[1];
+    regs[2] = (uint32_t)info[2];
+    regs[3] = (uint32_t)info[3];
+#else
+    __cpuid_count(leaf, subleaf, regs[0], regs[1], regs[2], regs[3]);
+#endif
+}
+
+/*
+   Read the XCR0 register to check which register states the OS saves
+   on context switches. Must only be called if OSXSAVE is set.
+*/
+static uint64_t xgetbv(void) {
+#ifdef _MSC_VER
+    return _xgetbv(0);
+#else
+    uint32_t eax, edx;
+    __asm__ __volatile__("xgetbv" : "=a"(eax), "=d"(edx) : "c"(0));
+    return ((uint64_t)edx << 32) | eax;
+#endif
+}
+#endif
+
+static int set_flag(PyObject *flags, const char *name, int supported) {
+    return PyDict_SetItemString(flags, name, supported ? Py_True : Py_False);
+}
+
+PyDoc_STRVAR(
+    cpuid_features_doc,
+    "features()\n"
+    "\n"
+    "Return a dict of the instruction sets used by the PoW implementations\n"
+    "and whether they're usable on this CPU. Instruction sets requiring\n"
+    "OS support for the wider registers are only reported as usable\n"
+    "if the OS has enabled them."
+);
+
+static PyObject *
+cpuid_features(PyObject *self, PyObject *args) {
+    int sse2 = 0, ssse3 = 0, sse4_1 = 0, avx = 0, avx2 = 0, avx512f = 0;
+    int neon = 0;
+    PyObject *flags;
+
+#ifdef CPUID_X86
+    uint32_t regs[4];
+    uint32_t max_leaf;
+
+    cpuid(0, 0, regs);
+    max_leaf = regs[0];
+
+    if (max_leaf >= 1) {
+        cpuid(1, 0, regs);
+
+        sse2 = (regs[3] >> 26) & 1;
+        ssse3 = (regs[2] >> 9) & 1;
+        sse4_1 = (regs[2] >> 19) & 1;
+
+        // AVX also requires the OS to save the YMM registers (XCR0 bits 1-2)
+        if (((regs[2] >> 27) & 1) && ((regs[2] >> 28) & 1)) {
+            uint64_t xcr0 = xgetbv();
+
+            avx = (xcr0 & 0x6) == 0x6;
+
+            if (avx && max_leaf >= 7) {
+                cpuid(7, 0, regs);
+
+                avx2 = (regs[1] >> 5) & 1;
+                // AVX-512 also requires the opmask and ZMM registers to be
+                // saved (XCR0 bits 5-7)
+                avx512f = ((regs[1] >> 16) & 1) && (xcr0 & 0xe6) == 0xe6;
+            }
+        }
+    }
+#elif defined(__aarch64__) || defined(_M_ARM64)
+    // NEON is a mandatory part of ARMv8-A
+    neon = 1;
+#elif defined(__arm__) && defined(__linux__)
+    neon = (getauxval(AT_HWCAP) & HWCAP_NEON) != 0;
+#endif
+
+    flags = PyDict_New();
+    if (flags == NULL) {
+        return NULL;
+    }
+
+    if (set_flag(flags, "avx512f", avx512f) < 0 ||
+            set_flag(flags, "avx2", avx2) < 0 ||
+            set_flag(flags, "avx", avx) < 0 ||
+            set_flag(flags, "sse4_1", sse4_1) < 0 ||
+            set_flag(flags, "ssse3", ssse3) < 0 ||
+            set_flag(flags, "sse2", sse2) < 0 ||
+            set_flag(flags, "neon", neon) < 0) {
+        Py_DECREF(flags);
+        return NULL;
+    }
+
+    return flags;
+}
+
+static PyMethodDef cpuid_methods[] = {
+    {"features", cpuid_features, METH_NOARGS, cpuid_features_doc},
+    {NULL, NULL, 0, NULL}
+};
+
+PyDoc_STRVAR(module_doc,
+"Function for detecting the instruction sets supported by the CPU");
+
+static struct PyModuleDef
+cpuid_module = {
+    PyModuleDef_HEAD_INIT,
+    "_cpuid",
+    module_doc,
+    -1,
+    cpuid_methods
+};
+
+PyMODINIT_FUNC PyInit__cpuid(void) {
+    return PyModule_Create(&cpuid_module);
+}
@@ -2,133 +2,126 @@
 #include "Python.h"
 
 #include <stdint.h>
-#include <stdio.h>
-
-#include "bit_array.h"
-
-#define NBASE32_CHAR_BITS 5
-#define NBase32ToBytesLen(size) ((size*5) / 8)
-#define BytesToNBase32Len(size) (((size*8) + 5 - 1) / 5)
-
-static const uint8_t NBASE32_TABLE[256] =
+#include <string.h>
+
+/*
+   Nano Base32 encodes every 5 bits as one character. Eight characters
+   correspond to exactly five bytes, so both conversions handle the
+   leading characters/bytes that don't fill a whole group separately and
+   then convert the rest one 40-bit group at a time.
+*/
+#define NBASE32_GROUP_CHARS 8
+#define NBASE32_GROUP_BYTES 5
+#define NBase32ToBytesLen(size) (((size)*5) / 8)
+#define BytesToNBase32Len(size) ((((size)*8) + 5 - 1) / 5)
+
+// Value of each character, or 0xff if the character isn't part of the
+// Nano Base32 alphabet
+static const uint8_t NBASE32_VALUES[256] =
 {
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 1, 2, 3, 4, 5,
-    6, 7, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 8, 9, 10, 11, 12, 13, 14,
-    15, 16, 17, 18, 0, 19, 20, 21,
-    22, 23, 24, 25, 26, 27, 0, 28,
-    29, 30, 31, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0,
-    0, 0, 0, 0, 0, 0, 0, 0
+    0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
+    0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
+    0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
+    0xff, 0x00, 0xff, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
+    0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
+    0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
+    0xff, 0x08, 0x09, 0x0a, 0x0b, 0x0c, 0x0d, 0x0e, 0x0f, 0x10, 0x11, 0x12, 0xff, 0x13, 0x14, 0x15,
+    0x16, 0x17, 0x18, 0x19, 0x1a, 0x1b, 0xff, 0x1c, 0x1d, 0x1e, 0x1f, 0xff, 0xff, 0xff, 0xff, 0xff,
+    0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
+    0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
+    0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
+    0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
+    0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
+    0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
+    0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
+    0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff
 };
 
-static const char NBASE32_VALID_TABLE[256] = "0000000000000000000000000000000000000000000000000101111111000000000000000000000000000000000000000111111111110111111111011110000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000";
 static const char NBASE32_CHARS[32] = "13456789abcdefghijkmnopqrstuwxyz";
 
-int nbase32_to_bytes(const uint8_t *nbase32, const ssize_t nbase32_size, uint8_t *result) {
-    uint64_t bitarr_bits = nbase32_size * 5;
+/*
+   Decode 'nbase32_size' characters into NBase32ToBytesLen(nbase32_size)
+   bytes. The leading bits that don't fill a whole byte are discarded.
+   Return 1 if the string contains invalid characters.
+*/
+static int nbase32_to_bytes(const uint8_t *nbase32, const Py_ssize_t nbase32_size, uint8_t *result) {
+    const Py_ssize_t head_size = nbase32_size % NBASE32_GROUP_CHARS;
+    uint64_t acc = 0;
+    uint8_t invalid = 0;
+    int acc_bits;
+    Py_ssize_t i;
+    int j;
+
+    // Skip the leading bits so that the remaining ones fill whole bytes
+    acc_bits = -(int)((head_size * 5) % 8);
+
+    for (i = 0; i < head_size; i++) {
+        uint8_t value = NBASE32_VALUES[nbase32[i]];
+
+        invalid |= value;
+        acc = (acc << 5) | (value & 0x1f);
+        acc_bits += 5;
+
+        if (acc_bits >= 8) {
+            acc_bits -= 8;
+            *result++ = (uint8_t)(acc >> acc_bits);
+        }
+    }
+
+    for (; i < nbase32_size; i += NBASE32_GROUP_CHARS) {
+        uint64_t group = 0;
 
-    BIT_ARRAY *bitarr = bit_array_create(bitarr_bits);
+        for (j = 0; j < NBASE32_GROUP_CHARS; j++) {
+            uint8_t value = NBASE32_VALUES[nbase32[i + j]];
 
-    for (uint64_t i=0; i < bitarr_bits; i += NBASE32_CHAR_BITS) {
-        uint8_t byte = nbase32[(i / NBASE32_CHAR_BITS)];
-        if (NBASE32_VALID_TABLE[byte] == 48) {
-            bit_array_free(bitarr);
-            return 1;
+            invalid |= value;
+            group = (group << 5) | (value & 0x1f);
         }
-        uint8_t value = NBASE32_TABLE[byte];
-        bit_array_assign(bitarr, i, (value >> 4) & 1);
-        bit_array_assign(bitarr, i+1, (value >> 3) & 1);
-        bit_array_assign(bitarr, i+2, (value >> 2) & 1);
-        bit_array_assign(bitarr, i+3, (value >> 1) & 1);
-        bit_array_assign(bitarr, i+4, (value >> 0) & 1);
-    }
 
-    uint8_t leftover = bitarr_bits % 8;
-
-    for (uint64_t i=leftover; i < bitarr_bits; i += 8) {
-        uint64_t byte_index = i / 8;
-
-        result[byte_index] = (uint8_t)(
-            (bit_array_get(bitarr, i) << 7) +
-            (bit_array_get(bitarr, i+1) << 6) +
-            (bit_array_get(bitarr, i+2) << 5) +
-            (bit_array_get(bitarr, i+3) << 4) +
-            (bit_array_get(bitarr, i+4) << 3) +
-            (bit_array_get(bitarr, i+5) << 2) +
-            (bit_array_get(bitarr, i+6) << 1) +
-            (bit_array_get(bitarr, i+7) << 0)
-        );
-    }
+        for (j = 0; j < NBASE32_GROUP_BYTES; j++) {
+            result[j] = (uint8_t)(group >> (32 - (j * 8)));
+        }
 
-    bit_array_free(bitarr);
+        result += NBASE32_GROUP_BYTES;
+    }
 
-    return 0;
-};
+    // Valid characters have values below 32, so any higher bit set means
+    // at least one invalid character
+    return (invalid & 0xe0) != 0;
+}
 
-void bytes_to_nbase32(const uint8_t *bytes, const ssize_t bytes_size, uint8_t *result) {
-    uint64_t bitarr_bits = bytes_size * 8;
-    uint8_t leftover = 5 - (bitarr_bits % 5);
-    bitarr_bits += leftover;
-
-    BIT_ARRAY *bitarr = bit_array_create(bitarr_bits);
-
-    for (uint64_t i=leftover; i < bitarr_bits; i += 8) {
-        uint32_t b_i = (i - leftover) / 8;
-        uint8_t value = bytes[b_i];
-        bit_array_assign(bitarr, i, (value >> 7) & 1);
-        bit_array_assign(bitarr, i+1, (value >> 6) & 1);
-        bit_array_assign(bitarr, i+2, (value >> 5) & 1);
-        bit_array_assign(bitarr, i+3, (value >> 4) & 1);
-        bit_array_assign(bitarr, i+4, (value >> 3) & 1);
-        bit_array_assign(bitarr, i+5, (value >> 2) & 1);
-        bit_array_assign(bitarr, i+6, (value >> 1) & 1);
-        bit_array_assign(bitarr, i+7, (value >> 0) & 1);
+/*
+   Encode 'bytes_size' bytes into BytesToNBase32Len(bytes_size) characters.
+   The leading character is padded with zero bits if the bits don't divide
+   evenly into characters.
+*/
+static void bytes_to_nbase32(const uint8_t *bytes, const Py_ssize_t bytes_size, uint8_t *result) {
+    const Py_ssize_t head_size = bytes_size % NBASE32_GROUP_BYTES;
+    const int head_chars = (int)BytesToNBase32Len(head_size);
+    uint64_t group = 0;
+    Py_ssize_t i;
+    int j;
+
+    for (i = 0; i < head_size; i++) {
+        group = (group << 8) | bytes[i];
     }
 
-    for (uint64_t i=0; i < bitarr_bits; i += 5) {
-        uint64_t byte_index = i / 5;
-        result[byte_index] = (uint8_t)(
-            (bit_array_get(bitarr, i) << 4) +
-            (bit_array_get(bitarr, i+1) << 3) +
-            (bit_array_get(bitarr, i+2) << 2) +
-            (bit_array_get(bitarr, i+3) << 1) +
-            (bit_array_get(bitarr, i+4) << 0)
-        );
+    for (j = 0; j < head_chars; j++) {
+        *result++ = NBASE32_CHARS[(group >> ((head_chars - j - 1) * 5)) & 0x1f];
     }
 
-    bit_array_free(bitarr);
+    for (; i < bytes_size; i += NBASE32_GROUP_BYTES) {
+        group = 0;
 
-    uint32_t result_size = BytesToNBase32Len(bytes_size);
+        for (j = 0; j < NBASE32_GROUP_BYTES; j++) {
+            group = (group << 8) | bytes[i + j];
+        }
 
-    uint8_t start = result_size % 8 == 0 ? 1 : 0;
+        for (j = 0; j < NBASE32_GROUP_CHARS; j++) {
+            result[j] = NBASE32_CHARS[(group >> (35 - (j * 5))) & 0x1f];
+        }
 
-    for (uint64_t i=start; i < result_size + start; i++) {
-        result[i-start] = NBASE32_CHARS[result[i]];
+        result += NBASE32_GROUP_CHARS;
     }
 }
 
@@ -142,6 +135,7 @@ nbase32_nbase32_to_bytes(PyObject *self, PyObject *args)
 {
     const uint8_t *nbase32;
     Py_ssize_t nbase32_size;
+    PyObject *result;
 
     if (!PyArg_ParseTuple(args, "y#", &nbase32, &nbase32_size)) {
         return NULL;
@@ -159,19 +153,21 @@ nbase32_nbase32_to_bytes(PyObject *self, PyObject *args)
         return NULL;
     }
 
-    uint32_t result_size = NBase32ToBytesLen(nbase32_size);
-    uint8_t *result = malloc(sizeof(uint8_t)*result_size);
-    int error = nbase32_to_bytes(nbase32, nbase32_size, result);
+    result = PyBytes_FromStringAndSize(NULL, NBase32ToBytesLen(nbase32_size));
+
+    if (result == NULL) {
+        return NULL;
+    }
 
-    if (error) {
+    if (nbase32_to_bytes(nbase32, nbase32_size,
+                         (uint8_t *)PyBytes_AS_STRING(result))) {
         PyErr_SetString(PyExc_ValueError,
                         "String is not Nano Base32-encoded");
-        free(result);
+        Py_DECREF(result);
         return NULL;
     }
 
-    PyObject *ret = Py_BuildValue("y#", result, result_size);
-    return ret;
+    return result;
 };
 
 PyDoc_STRVAR(nbase32_bytes_to_nbase32_doc,
@@ -184,6 +180,7 @@ nbase32_bytes_to_nbase32(PyObject *self, PyObject *args)
 {
     const uint8_t *bytes;
     Py_ssize_t bytes_size;
+    PyObject *result;
 
     if (!PyArg_ParseTuple(args, "y#", &bytes, &bytes_size)) {
         return NULL;
@@ -195,19 +192,21 @@ nbase32_bytes_to_nbase32(PyObject *self, PyObject *args)
         return NULL;
     }
 
-    uint64_t result_size = BytesToNBase32Len(bytes_size);
-
-    if (result_size > UINT32_MAX) {
+    if ((uint64_t)BytesToNBase32Len((uint64_t)bytes_size) > UINT32_MAX) {
         PyErr_SetString(PyExc_ValueError,
                         "Resulting Base32 string longer than (2**32)-1 bytes");
         return NULL;
     }
 
-    uint8_t *result = malloc(sizeof(uint8_t)*result_size);
-    bytes_to_nbase32(bytes, bytes_size, result);
+    result = PyBytes_FromStringAndSize(NULL, BytesToNBase32Len(bytes_size));
+
+    if (result == NULL) {
+        return NULL;
+    }
+
+    bytes_to_nbase32(bytes, bytes_size, (uint8_t *)PyBytes_AS_STRING(result));
 
-    PyObject *ret = Py_BuildValue("y#", result, result_size);
-    return ret;
+    return result;
 }
 
 static PyMethodDef nbase32_methods[] = {
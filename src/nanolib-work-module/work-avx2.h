@@ -0,0 +1,181 @@
+/*
+   AVX2 implementation of the NANO PoW search.
+
+   Instead of using SIMD within a single BLAKE2b compression, four nonces are
+   hashed at once: each of the 16 state words v0..v15 is an __m256i holding
+   that word for all four lanes. The PoW message always fits into a single
+   block, so the compression is specialized for a 40-byte message
+   (nonce || block hash) and an 8-byte digest.
+
+   Batch validation uses the same kernel with a different block hash in each
+   lane. The block hashes are transposed into the lanes using gathers.
+*/
+#ifndef WORK_AVX2_H
+#define WORK_AVX2_H
+
+#include <immintrin.h>
+
+#define AVX2_LANES 4
+
+#define AVX2_ROTR32(x) _mm256_shuffle_epi32((x), _MM_SHUFFLE(2, 3, 0, 1))
+#define AVX2_ROTR24(x) _mm256_shuffle_epi8((x), rotr24)
+#define AVX2_ROTR16(x) _mm256_shuffle_epi8((x), rotr16)
+#define AVX2_ROTR63(x) \
+    _mm256_or_si256(_mm256_srli_epi64((x), 63), _mm256_add_epi64((x), (x)))
+
+#define AVX2_G(a, b, c, d, x, y)                              \
+    do {                                                      \
+        a = _mm256_add_epi64(_mm256_add_epi64(a, b), x);      \
+        d = AVX2_ROTR32(_mm256_xor_si256(d, a));              \
+        c = _mm256_add_epi64(c, d);                           \
+        b = AVX2_ROTR24(_mm256_xor_si256(b, c));              \
+        a = _mm256_add_epi64(_mm256_add_epi64(a, b), y);      \
+        d = AVX2_ROTR16(_mm256_xor_si256(d, a));              \
+        c = _mm256_add_epi64(c, d);                           \
+        b = AVX2_ROTR63(_mm256_xor_si256(b, c));              \
+    } while (0)
+
+/*
+   Calculate the work values for four nonces at once. 'block_hash' contains
+   the four 64-bit words of the block hash for each lane.
+*/
+POW_INLINE __m256i pow_avx2_hash(const __m256i nonces, const __m256i block_hash[4]) {
+    const __m256i rotr24 = _mm256_setr_epi8(
+        3, 4, 5, 6, 7, 0, 1, 2, 11, 12, 13, 14, 15, 8, 9, 10,
+        3, 4, 5, 6, 7, 0, 1, 2, 11, 12, 13, 14, 15, 8, 9, 10);
+    const __m256i rotr16 = _mm256_setr_epi8(
+        2, 3, 4, 5, 6, 7, 0, 1, 10, 11, 12, 13, 14, 15, 8, 9,
+        2, 3, 4, 5, 6, 7, 0, 1, 10, 11, 12, 13, 14, 15, 8, 9);
+
+    __m256i m[16];
+    __m256i v[16];
+    int i;
+
+    m[0] = nonces;
+    for (i = 0; i < 4; i++) {
+        m[i + 1] = block_hash[i];
+    }
+    for (i = 5; i < 16; i++) {
+        m[i] = _mm256_setzero_si256();
+    }
+
+    const uint64_t h0 = POW_H0;
+
+    v[0] = _mm256_set1_epi64x((long long)h0);
+    for (i = 1; i < 8; i++) {
+        v[i] = _mm256_set1_epi64x((long long)pow_IV[i]);
+    }
+    for (i = 0; i < 8; i++) {
+        v[i + 8] = _mm256_set1_epi64x((long long)pow_IV[i]);
+    }
+
+    // Set the message length and mark this as the last block
+    v[12] = _mm256_xor_si256(v[12], _mm256_set1_epi64x(POW_MESSAGE_BYTES));
+    v[14] = _mm256_xor_si256(v[14], _mm256_set1_epi64x(-1));
+
+    POW_ROUNDS(AVX2_G);
+
+    // Only the first 8 bytes of the digest are needed
+    return _mm256_xor_si256(
+        _mm256_set1_epi64x((long long)h0), _mm256_xor_si256(v[0], v[8]));
+}
+
+int do_work(const uint8_t block_hash[HASH_BYTES], uint64_t *nonce, const uint64_t threshold, uint32_t iterations) {
+    uint64_t work = *nonce;
+    __m256i block_hash_words[4];
+    int i;
+
+    const __m256i lane_offsets = _mm256_setr_epi64x(1, 2, 3, 4);
+
+    // AVX2 only has a signed 64-bit comparison, so both sides are offset by
+    // 2^63 to compare them as unsigned
+    const __m256i sign_bit = _mm256_set1_epi64x(INT64_MIN);
+    const __m256i thresholds = _mm256_xor_si256(
+        _mm256_set1_epi64x((long long)threshold), sign_bit);
+
+    // Every lane hashes the same block hash
+    for (i = 0; i < 4; i++) {
+        block_hash_words[i] = _mm256_set1_epi64x(
+            (long long)load64(block_hash + (i * 8)));
+    }
+
+    while (iterations > 0) {
+        __m256i nonces = _mm256_add_epi64(
+            _mm256_set1_epi64x((long long)work), lane_offsets);
+
+        __m256i values = _mm256_xor_si256(
+            pow_avx2_hash(nonces, block_hash_words), sign_bit);
+
+        // A lane meets the threshold unless the threshold is greater than it
+        int found = ~_mm256_movemask_pd(_mm256_castsi256_pd(
+            _mm256_cmpgt_epi64(thresholds, values))) & 0xf;
+
+        if (found) {
+            *nonce = work + lowest_set_bit(found) + 1;
+            return 1;
+        }
+
+        work += AVX2_LANES;
+        iterations = iterations > AVX2_LANES ? iterations - AVX2_LANES : 0;
+    }
+
+    *nonce = work;
+
+    return 0;
+}
+
+/*
+   Calculate the work values for four consecutive block hashes and works
+*/
+static inline void pow_avx2_work_values(const uint8_t *block_hashes,
+                                        const uint8_t *works,
+                                        uint64_t values[AVX2_LANES]) {
+    // Offsets of the same word in consecutive block hashes, in 64-bit words
+    const __m128i hash_offsets = _mm_setr_epi32(0, 4, 8, 12);
+    __m256i block_hash_words[4];
+    int i;
+
+    for (i = 0; i < 4; i++) {
+        block_hash_words[i] = _mm256_i32gather_epi64(
+            (const long long *)(block_hashes + (i * 8)), hash_offsets, 8);
+    }
+
+    _mm256_storeu_si256(
+        (__m256i *)values,
+        pow_avx2_hash(
+            _mm256_loadu_si256((const __m256i *)works), block_hash_words));
+}
+
+void validate_batch(const uint8_t *block_hashes, const uint8_t *works,
+                    const Py_ssize_t count, const uint64_t threshold,
+                    uint8_t *results) {
+    uint64_t values[AVX2_LANES];
+    uint8_t tail_block_hashes[AVX2_LANES * HASH_BYTES] = {0};
+    uint8_t tail_works[AVX2_LANES * WORK_BYTES] = {0};
+    Py_ssize_t i;
+    int lane;
+
+    for (i = 0; i + AVX2_LANES <= count; i += AVX2_LANES) {
+        pow_avx2_work_values(
+            block_hashes + (i * HASH_BYTES), works + (i * WORK_BYTES), values);
+
+        for (lane = 0; lane < AVX2_LANES; lane++) {
+            results[i + lane] = values[lane] >= threshold;
+        }
+    }
+
+    // Pad the remaining PoWs to a full vector
+    if (i < count) {
+        memcpy(tail_block_hashes, block_hashes + (i * HASH_BYTES),
+               (count - i) * HASH_BYTES);
+        memcpy(tail_works, works + (i * WORK_BYTES), (count - i) * WORK_BYTES);
+
+        pow_avx2_work_values(tail_block_hashes, tail_works, values);
+
+        for (lane = 0; i + lane < count; lane++) {
+            results[i + lane] = values[lane] >= threshold;
+        }
+    }
+}
+
+#endif
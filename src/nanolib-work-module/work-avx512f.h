@@ -0,0 +1,165 @@
+/*
+   AVX-512 implementation of the NANO PoW search.
+
+   Works the same way as the AVX2 implementation, but hashes eight nonces at
+   once using 512-bit vectors. AVX-512 has native 64-bit rotations and
+   unsigned comparisons, so no byte shuffles are needed.
+
+   Batch validation transposes eight block hashes into the lanes using
+   gathers.
+*/
+#ifndef WORK_AVX512F_H
+#define WORK_AVX512F_H
+
+#include <immintrin.h>
+
+#ifdef _MSC_VER
+#include <intrin.h>
+#endif
+
+#define AVX512_LANES 8
+
+#define AVX512_G(a, b, c, d, x, y)                            \
+    do {                                                      \
+        a = _mm512_add_epi64(_mm512_add_epi64(a, b), x);      \
+        d = _mm512_ror_epi64(_mm512_xor_si512(d, a), 32);     \
+        c = _mm512_add_epi64(c, d);                           \
+        b = _mm512_ror_epi64(_mm512_xor_si512(b, c), 24);     \
+        a = _mm512_add_epi64(_mm512_add_epi64(a, b), y);      \
+        d = _mm512_ror_epi64(_mm512_xor_si512(d, a), 16);     \
+        c = _mm512_add_epi64(c, d);                           \
+        b = _mm512_ror_epi64(_mm512_xor_si512(b, c), 63);     \
+    } while (0)
+
+/*
+   Calculate the work values for eight nonces at once. 'block_hash' contains
+   the four 64-bit words of the block hash for each lane.
+*/
+POW_INLINE __m512i pow_avx512_hash(const __m512i nonces, const __m512i block_hash[4]) {
+    __m512i m[16];
+    __m512i v[16];
+    int i;
+
+    m[0] = nonces;
+    for (i = 0; i < 4; i++) {
+        m[i + 1] = block_hash[i];
+    }
+    for (i = 5; i < 16; i++) {
+        m[i] = _mm512_setzero_si512();
+    }
+
+    const uint64_t h0 = POW_H0;
+
+    v[0] = _mm512_set1_epi64((long long)h0);
+    for (i = 1; i < 8; i++) {
+        v[i] = _mm512_set1_epi64((long long)pow_IV[i]);
+    }
+    for (i = 0; i < 8; i++) {
+        v[i + 8] = _mm512_set1_epi64((long long)pow_IV[i]);
+    }
+
+    // Set the message length and mark this as the last block
+    v[12] = _mm512_xor_si512(v[12], _mm512_set1_epi64(POW_MESSAGE_BYTES));
+    v[14] = _mm512_xor_si512(v[14], _mm512_set1_epi64(-1));
+
+    POW_ROUNDS(AVX512_G);
+
+    // Only the first 8 bytes of the digest are needed
+    return _mm512_xor_si512(
+        _mm512_set1_epi64((long long)h0), _mm512_xor_si512(v[0], v[8]));
+}
+
+int do_work(const uint8_t block_hash[HASH_BYTES], uint64_t *nonce, const uint64_t threshold, uint32_t iterations) {
+    uint64_t work = *nonce;
+    __m512i block_hash_words[4];
+    int i;
+
+    const __m512i lane_offsets = _mm512_setr_epi64(1, 2, 3, 4, 5, 6, 7, 8);
+    const __m512i thresholds = _mm512_set1_epi64((long long)threshold);
+
+    // Every lane hashes the same block hash
+    for (i = 0; i < 4; i++) {
+        block_hash_words[i] = _mm512_set1_epi64(
+            (long long)load64(block_hash + (i * 8)));
+    }
+
+    while (iterations > 0) {
+        __m512i nonces = _mm512_add_epi64(
+            _mm512_set1_epi64((long long)work), lane_offsets);
+
+        __mmask8 found = _mm512_cmpge_epu64_mask(
+            pow_avx512_hash(nonces, block_hash_words), thresholds);
+
+        if (found) {
+            *nonce = work + lowest_set_bit(found) + 1;
+            return 1;
+        }
+
+        work += AVX512_LANES;
+        iterations = iterations > AVX512_LANES ? iterations - AVX512_LANES : 0;
+    }
+
+    *nonce = work;
+
+    return 0;
+}
+
+/*
+   Check eight consecutive block hashes and works against the threshold,
+   returning a mask with a bit set for each PoW meeting it
+*/
+static inline __mmask8 pow_avx512_validate(const uint8_t *block_hashes,
+                                           const uint8_t *works,
+                                           const __m512i thresholds) {
+    // Offsets of the same word in consecutive block hashes, in 64-bit words
+    const __m512i hash_offsets = _mm512_setr_epi64(
+        0, 4, 8, 12, 16, 20, 24, 28);
+    __m512i block_hash_words[4];
+    int i;
+
+    for (i = 0; i < 4; i++) {
+        block_hash_words[i] = _mm512_i64gather_epi64(
+            hash_offsets, (const void *)(block_hashes + (i * 8)), 8);
+    }
+
+    return _mm512_cmpge_epu64_mask(
+        pow_avx512_hash(_mm512_loadu_si512((const void *)works),
+                        block_hash_words),
+        thresholds);
+}
+
+void validate_batch(const uint8_t *block_hashes, const uint8_t *works,
+                    const Py_ssize_t count, const uint64_t threshold,
+                    uint8_t *results) {
+    const __m512i thresholds = _mm512_set1_epi64((long long)threshold);
+    uint8_t tail_block_hashes[AVX512_LANES * HASH_BYTES] = {0};
+    uint8_t tail_works[AVX512_LANES * WORK_BYTES] = {0};
+    __mmask8 found;
+    Py_ssize_t i;
+    int lane;
+
+    for (i = 0; i + AVX512_LANES <= count; i += AVX512_LANES) {
+        found = pow_avx512_validate(
+            block_hashes + (i * HASH_BYTES), works + (i * WORK_BYTES),
+            thresholds);
+
+        for (lane = 0; lane < AVX512_LANES; lane++) {
+            results[i + lane] = (found >> lane) & 1;
+        }
+    }
+
+    // Pad the remaining PoWs to a full vector
+    if (i < count) {
+        memcpy(tail_block_hashes, block_hashes + (i * HASH_BYTES),
+               (count - i) * HASH_BYTES);
+        memcpy(tail_works, works + (i * WORK_BYTES), (count - i) * WORK_BYTES);
+
+        found = pow_avx512_validate(tail_block_hashes, tail_works, thresholds);
+
+        for (lane = 0; i + lane < count; lane++) {
+            results[i + lane] = (found >> lane) & 1;
+        }
+    }
+}
+
+#endif
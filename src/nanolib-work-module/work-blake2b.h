@@ -0,0 +1,58 @@
+/*
+   BLAKE2b constants and round schedule shared by the PoW kernels.
+
+   Every kernel stores the working state as v[0..15] and the message as
+   m[0..15], where each element holds that word for every lane the kernel
+   hashes at once (a single uint64_t for the scalar kernel, an __m256i or
+   __m512i for the SIMD kernels). Since the lanes never mix, the column and
+   diagonal steps are the same for every kernel and only the G function
+   differs.
+*/
+#ifndef WORK_BLAKE2B_H
+#define WORK_BLAKE2B_H
+
+static const uint64_t pow_IV[8] = {
+    0x6a09e667f3bcc908ULL, 0xbb67ae8584caa73bULL,
+    0x3c6ef372fe94f82bULL, 0xa54ff53a5f1d36f1ULL,
+    0x510e527fade682d1ULL, 0x9b05688c2b3e6c1fULL,
+    0x1f83d9abfb41bd6bULL, 0x5be0cd19137e2179ULL
+};
+
+// First word of the initial state: the parameter block for an unkeyed
+// 8-byte digest
+#define POW_H0 (0x6a09e667f3bcc908ULL ^ 0x01010008ULL)
+
+// Message length is 40 bytes (nonce || block hash)
+#define POW_MESSAGE_BYTES 40
+
+#define POW_ROUND(G, s0, s1, s2, s3, s4, s5, s6, s7,                     \
+                  s8, s9, s10, s11, s12, s13, s14, s15)                  \
+    do {                                                                 \
+        G(v[0], v[4], v[8], v[12], m[s0], m[s1]);                        \
+        G(v[1], v[5], v[9], v[13], m[s2], m[s3]);                        \
+        G(v[2], v[6], v[10], v[14], m[s4], m[s5]);                       \
+        G(v[3], v[7], v[11], v[15], m[s6], m[s7]);                       \
+        G(v[0], v[5], v[10], v[15], m[s8], m[s9]);                       \
+        G(v[1], v[6], v[11], v[12], m[s10], m[s11]);                     \
+        G(v[2], v[7], v[8], v[13], m[s12], m[s13]);                      \
+        G(v[3], v[4], v[9], v[14], m[s14], m[s15]);                      \
+    } while (0)
+
+// All 12 rounds with the message schedule resolved at compile time
+#define POW_ROUNDS(G)                                                            \
+    do {                                                                         \
+        POW_ROUND(G, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15);      \
+        POW_ROUND(G, 14, 10, 4, 8, 9, 15, 13, 6, 1, 12, 0, 2, 11, 7, 5, 3);      \
+        POW_ROUND(G, 11, 8, 12, 0, 5, 2, 15, 13, 10, 14, 3, 6, 7, 1, 9, 4);      \
+        POW_ROUND(G, 7, 9, 3, 1, 13, 12, 11, 14, 2, 6, 5, 10, 4, 0, 15, 8);      \
+        POW_ROUND(G, 9, 0, 5, 7, 2, 4, 10, 15, 14, 1, 11, 12, 6, 8, 3, 13);      \
+        POW_ROUND(G, 2, 12, 6, 10, 0, 11, 8, 3, 4, 13, 7, 5, 15, 14, 1, 9);      \
+        POW_ROUND(G, 12, 5, 1, 15, 14, 13, 4, 10, 0, 7, 6, 3, 9, 2, 8, 11);      \
+        POW_ROUND(G, 13, 11, 7, 14, 12, 1, 3, 9, 5, 0, 15, 4, 8, 6, 2, 10);      \
+        POW_ROUND(G, 6, 15, 14, 9, 11, 3, 0, 8, 12, 2, 13, 7, 1, 4, 10, 5);      \
+        POW_ROUND(G, 10, 2, 8, 4, 7, 6, 1, 5, 15, 11, 9, 14, 3, 12, 13, 0);      \
+        POW_ROUND(G, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15);      \
+        POW_ROUND(G, 14, 10, 4, 8, 9, 15, 13, 6, 1, 12, 0, 2, 11, 7, 5, 3);      \
+    } while (0)
+
+#endif
@@ -0,0 +1,62 @@
+/*
+   Scalar BLAKE2b compression for the NANO PoW.
+
+   The PoW message (nonce || block hash) always fits into a single block, so
+   instead of going through the generic BLAKE2b API the compression is
+   specialized for a 40-byte message and an 8-byte digest: the counter and
+   finalization flag are baked into the initial state, the message schedule
+   is resolved at compile time and only the first digest word is computed.
+
+   This is used by the implementations without a multi-lane kernel, and by
+   every implementation to calculate the work value of a single nonce.
+*/
+#ifndef WORK_SCALAR_H
+#define WORK_SCALAR_H
+
+#define SCALAR_ROTR64(x, n) (((x) >> (n)) | ((x) << (64 - (n))))
+
+#define SCALAR_G(a, b, c, d, x, y)                            \
+    do {                                                      \
+        a = a + b + x;                                        \
+        d = SCALAR_ROTR64(d ^ a, 32);                         \
+        c = c + d;                                            \
+        b = SCALAR_ROTR64(b ^ c, 24);                         \
+        a = a + b + y;                                        \
+        d = SCALAR_ROTR64(d ^ a, 16);                         \
+        c = c + d;                                            \
+        b = SCALAR_ROTR64(b ^ c, 63);                         \
+    } while (0)
+
+/*
+   Calculate the work value for a nonce. 'block_hash' contains the four
+   64-bit words of the block hash.
+*/
+POW_INLINE uint64_t pow_scalar_hash(const uint64_t nonce, const uint64_t block_hash[4]) {
+    uint64_t m[16] = {
+        nonce, block_hash[0], block_hash[1], block_hash[2], block_hash[3],
+        0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0
+    };
+    uint64_t v[16];
+    int i;
+
+    const uint64_t h0 = POW_H0;
+
+    v[0] = h0;
+    for (i = 1; i < 8; i++) {
+        v[i] = pow_IV[i];
+    }
+    for (i = 0; i < 8; i++) {
+        v[i + 8] = pow_IV[i];
+    }
+
+    // Set the message length and mark this as the last block
+    v[12] ^= POW_MESSAGE_BYTES;
+    v[14] = ~v[14];
+
+    POW_ROUNDS(SCALAR_G);
+
+    // Only the first 8 bytes of the digest are needed
+    return h0 ^ v[0] ^ v[8];
+}
+
+#endif
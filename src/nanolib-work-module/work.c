@@ -1,43 +1,101 @@
 #define PY_SSIZE_T_CLEAN 1
 #include "Python.h"
 
-#include "blake2.h"
+#include "blake2-impl.h"
 
 #include <stdint.h>
 #include <stdio.h>
+#include <string.h>
+
+#ifdef _MSC_VER
+#include <intrin.h>
+#endif
 
 #define HASH_BYTES 32
+#define WORK_BYTES 8
 #define ITERATION_COUNT 250000
 
+// The PoW kernels are called from both the PoW search and the batch
+// validation loops, so they need to be inlined explicitly
+#ifdef _MSC_VER
+#define POW_INLINE static __forceinline
+#else
+#define POW_INLINE static inline __attribute__((always_inline))
+#endif
 
-uint64_t do_work(const uint8_t block_hash[HASH_BYTES], const uint64_t nonce, const uint64_t threshold) {
-    uint64_t work = nonce;
-    uint64_t result = 0;
+// Return the index of the first lane in a non-zero mask of found lanes
+static inline int lowest_set_bit(unsigned int mask) {
+#ifdef _MSC_VER
+    unsigned long index;
+    _BitScanForward(&index, mask);
+    return (int)index;
+#else
+    return __builtin_ctz(mask);
+#endif
+}
 
-    blake2b_state hash;
-    blake2b_init(&hash, sizeof(result));
+#include "work-blake2b.h"
+#include "work-scalar.h"
 
-    uint32_t iterations = ITERATION_COUNT;
+#if defined(WORK_AVX512F)
+#include "work-avx512f.h"
+#elif defined(WORK_AVX2)
+#include "work-avx2.h"
+#else
+int do_work(const uint8_t block_hash[HASH_BYTES], uint64_t *nonce, const uint64_t threshold, uint32_t iterations) {
+    uint64_t work = *nonce;
+    uint64_t result = 0;
+    uint64_t block_hash_words[4];
+    int i;
+
+    // Both the nonce and the work value are little-endian regardless of
+    // the host's byte order
+    for (i = 0; i < 4; i++) {
+        block_hash_words[i] = load64(block_hash + (i * 8));
+    }
 
     while (iterations > 0 && result < threshold) {
         work++;
-
-        blake2b_update(&hash, &work, sizeof(work));
-        blake2b_update(&hash, block_hash, HASH_BYTES);
-        blake2b_final(&hash, &result, sizeof(result));
-        blake2b_init(&hash, sizeof(result));
-
+        result = pow_scalar_hash(work, block_hash_words);
         iterations--;
     }
 
-    return work;
+    *nonce = work;
+
+    return result >= threshold;
 }
 
+void validate_batch(const uint8_t *block_hashes, const uint8_t *works,
+                    const Py_ssize_t count, const uint64_t threshold,
+                    uint8_t *results) {
+    uint64_t block_hash_words[4];
+
+    for (Py_ssize_t i = 0; i < count; i++) {
+        const uint8_t *block_hash = block_hashes + (i * HASH_BYTES);
+
+        block_hash_words[0] = load64(block_hash);
+        block_hash_words[1] = load64(block_hash + 8);
+        block_hash_words[2] = load64(block_hash + 16);
+        block_hash_words[3] = load64(block_hash + 24);
+
+        results[i] = pow_scalar_hash(
+            load64(works + (i * WORK_BYTES)), block_hash_words) >= threshold;
+    }
+}
+#endif
+
 PyDoc_STRVAR(work_do_work_doc,
-"do_work(block_hash, nonce, threshold)\n\
+"do_work(block_hash, nonce, threshold, iterations=250000)\n\
 \n\
-Perform work on a block PoW. Return a positive 64-bit nonce if a match was found,\n\
-otherwise return 0.");
+Perform work on a block PoW, trying 'iterations' nonces starting from\n\
+'nonce + 1'. Implementations hashing multiple nonces at once round\n\
+'iterations' up to a multiple of the amount of nonces per hash.\n\
+\n\
+Return a (nonce, found) tuple where 'nonce' is the first nonce meeting\n\
+the threshold if 'found' is True, otherwise the last nonce that was tried.\n\
+A nonce meets the threshold if the first 8 bytes of its BLAKE2b digest,\n\
+read as a little-endian 64-bit integer, are equal to or greater than\n\
+'threshold'.");
 
 static PyObject *
 work_do_work(PyObject *self, PyObject *args)
@@ -46,9 +104,11 @@ work_do_work(PyObject *self, PyObject *args)
     Py_ssize_t block_hash_size;
     uint64_t nonce;
     uint64_t threshold;
+    unsigned int iterations = ITERATION_COUNT;
 
-    if (!PyArg_ParseTuple(args, "y#KK",
-                          &block_hash, &block_hash_size, &nonce, &threshold)) {
+    if (!PyArg_ParseTuple(args, "y#KK|I",
+                          &block_hash, &block_hash_size, &nonce, &threshold,
+                          &iterations)) {
         return NULL;
     }
 
@@ -58,17 +118,103 @@ work_do_work(PyObject *self, PyObject *args)
         return NULL;
     }
 
-    uint64_t result = 0;
+    int found = 0;
     Py_BEGIN_ALLOW_THREADS
-    result = do_work(block_hash, nonce, threshold);
+    found = do_work(block_hash, &nonce, threshold, iterations);
+    Py_END_ALLOW_THREADS
+
+    PyObject *ret = Py_BuildValue("KN", nonce, PyBool_FromLong(found));
+    return ret;
+}
+
+PyDoc_STRVAR(work_work_value_doc,
+"work_value(block_hash, nonce)\n\
+\n\
+Return the work value for a nonce as an integer: the first 8 bytes of\n\
+the BLAKE2b digest of the little-endian nonce followed by the block hash,\n\
+read as a little-endian 64-bit integer.");
+
+static PyObject *
+work_work_value(PyObject *self, PyObject *args)
+{
+    const uint8_t *block_hash;
+    Py_ssize_t block_hash_size;
+    uint64_t nonce;
+    uint64_t block_hash_words[4];
+    int i;
+
+    if (!PyArg_ParseTuple(args, "y#K", &block_hash, &block_hash_size, &nonce)) {
+        return NULL;
+    }
+
+    if (block_hash_size != HASH_BYTES) {
+        PyErr_SetString(PyExc_TypeError,
+                        "'block_hash' needs to have a size of exactly 32 bytes");
+        return NULL;
+    }
+
+    for (i = 0; i < 4; i++) {
+        block_hash_words[i] = load64(block_hash + (i * 8));
+    }
+
+    return PyLong_FromUnsignedLongLong(
+        pow_scalar_hash(nonce, block_hash_words));
+}
+
+PyDoc_STRVAR(work_validate_batch_doc,
+"validate_batch(block_hashes, works, threshold)\n\
+\n\
+Validate multiple PoWs at once. 'block_hashes' contains concatenated 32-byte\n\
+block hashes and 'works' the corresponding concatenated 8-byte little-endian\n\
+nonces. Return bytes containing 1 for each PoW meeting the threshold,\n\
+otherwise 0.");
+
+static PyObject *
+work_validate_batch(PyObject *self, PyObject *args)
+{
+    const uint8_t *block_hashes;
+    Py_ssize_t block_hashes_size;
+    const uint8_t *works;
+    Py_ssize_t works_size;
+    uint64_t threshold;
+
+    if (!PyArg_ParseTuple(args, "y#y#K",
+                          &block_hashes, &block_hashes_size,
+                          &works, &works_size, &threshold)) {
+        return NULL;
+    }
+
+    if (block_hashes_size % HASH_BYTES != 0) {
+        PyErr_SetString(PyExc_TypeError,
+                        "'block_hashes' size needs to be a multiple of 32 bytes");
+        return NULL;
+    }
+
+    Py_ssize_t count = block_hashes_size / HASH_BYTES;
+
+    if (works_size != count * WORK_BYTES) {
+        PyErr_SetString(PyExc_TypeError,
+                        "'works' needs to have exactly 8 bytes for each block hash");
+        return NULL;
+    }
+
+    PyObject *ret = PyBytes_FromStringAndSize(NULL, count);
+    if (ret == NULL) {
+        return NULL;
+    }
+
+    uint8_t *results = (uint8_t *)PyBytes_AS_STRING(ret);
+    Py_BEGIN_ALLOW_THREADS
+    validate_batch(block_hashes, works, count, threshold, results);
     Py_END_ALLOW_THREADS
 
-    PyObject *ret = Py_BuildValue("K", result);
     return ret;
 }
 
 static PyMethodDef work_methods[] = {
     {"do_work", work_do_work, METH_VARARGS, work_do_work_doc},
+    {"work_value", work_work_value, METH_VARARGS, work_work_value_doc},
+    {"validate_batch", work_validate_batch, METH_VARARGS, work_validate_batch_doc},
     {NULL, NULL, 0, NULL}
 };
 
@@ -88,6 +234,10 @@ work_module = {
     "_work_sse4_1",
     #elif WORK_AVX
     "_work_avx",
+    #elif WORK_AVX2
+    "_work_avx2",
+    #elif WORK_AVX512F
+    "_work_avx512f",
     #elif WORK_NEON
     "_work_neon",
     #endif
@@ -116,6 +266,14 @@ PyMODINIT_FUNC PyInit__work_sse4_1(void) {
 PyMODINIT_FUNC PyInit__work_avx(void) {
     return PyModule_Create(&work_module);
 }
+#elif WORK_AVX2
+PyMODINIT_FUNC PyInit__work_avx2(void) {
+    return PyModule_Create(&work_module);
+}
+#elif WORK_AVX512F
+PyMODINIT_FUNC PyInit__work_avx512f(void) {
+    return PyModule_Create(&work_module);
+}
 #elif WORK_NEON
 PyMODINIT_FUNC PyInit__work_neon(void) {
     return PyModule_Create(&work_module);
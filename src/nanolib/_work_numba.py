@@ -0,0 +1,240 @@
+"""
+nanolib._work_numba
+~~~~~~~~~~~~~~~~~~~
+
+Numba implementation of the NANO proof-of-work, used as a fallback when
+the PoW C extensions haven't been built. This module requires `numba` and
+raises an ImportError if it's not installed.
+
+The module has the same interface as the C extensions.
+"""
+import numpy as np
+from numba import get_num_threads, njit, prange
+
+# Amount of nonces tried during one do_work() call by default
+ITERATION_COUNT = 250000
+
+# do_work() already searches on every thread Numba is configured to use.
+# Numba's parallel functions must not be called from multiple threads at
+# once either, as the default 'workqueue' threading layer aborts the process
+# if it detects concurrent access.
+MULTITHREADED = True
+
+_IV = np.array([
+    0x6a09e667f3bcc908, 0xbb67ae8584caa73b,
+    0x3c6ef372fe94f82b, 0xa54ff53a5f1d36f1,
+    0x510e527fade682d1, 0x9b05688c2b3e6c1f,
+    0x1f83d9abfb41bd6b, 0x5be0cd19137e2179
+], dtype=np.uint64)
+
+# Parameter block for an unkeyed 8-byte digest
+_H0 = _IV[0] ^ np.uint64(0x01010008)
+
+
+@njit(inline="always")
+def _rotr(x, n):
+    return (x >> np.uint64(n)) | (x << np.uint64(64 - n))
+
+
+@njit(inline="always")
+def _g(a, b, c, d, x, y):
+    a = a + b + x
+    d = _rotr(d ^ a, 32)
+    c = c + d
+    b = _rotr(b ^ c, 24)
+    a = a + b + y
+    d = _rotr(d ^ a, 16)
+    c = c + d
+    b = _rotr(b ^ c, 63)
+
+    return a, b, c, d
+
+
+@njit(inline="always")
+def _round(v, m):
+    """
+    Perform one round of the compression, with the message words `m` already
+    permuted according to the round's sigma
+    """
+    v0, v1, v2, v3, v4, v5, v6, v7, v8, v9, v10, v11, v12, v13, v14, v15 = v
+
+    v0, v4, v8, v12 = _g(v0, v4, v8, v12, m[0], m[1])
+    v1, v5, v9, v13 = _g(v1, v5, v9, v13, m[2], m[3])
+    v2, v6, v10, v14 = _g(v2, v6, v10, v14, m[4], m[5])
+    v3, v7, v11, v15 = _g(v3, v7, v11, v15, m[6], m[7])
+    v0, v5, v10, v15 = _g(v0, v5, v10, v15, m[8], m[9])
+    v1, v6, v11, v12 = _g(v1, v6, v11, v12, m[10], m[11])
+    v2, v7, v8, v13 = _g(v2, v7, v8, v13, m[12], m[13])
+    v3, v4, v9, v14 = _g(v3, v4, v9, v14, m[14], m[15])
+
+    return (
+        v0, v1, v2, v3, v4, v5, v6, v7, v8, v9, v10, v11, v12, v13, v14, v15
+    )
+
+
+@njit(nogil=True, cache=True)
+def _work_value(nonce, h):
+    """
+    Calculate the work value for a nonce and the block hash `h` given as
+    four little-endian 64-bit words.
+
+    The message (nonce || block hash) always fits into a single block, so
+    the compression is specialized for a 40-byte message and an 8-byte digest.
+    """
+    m0, m1, m2, m3, m4 = nonce, h[0], h[1], h[2], h[3]
+    m5 = m6 = m7 = m8 = m9 = m10 = m11 = m12 = m13 = m14 = m15 = \
+        np.uint64(0)
+
+    v = (
+        _H0, _IV[1], _IV[2], _IV[3], _IV[4], _IV[5], _IV[6], _IV[7],
+        _IV[0], _IV[1], _IV[2], _IV[3],
+        # Message length is 40 bytes and this is the last block
+        _IV[4] ^ np.uint64(40), _IV[5], ~_IV[6], _IV[7]
+    )
+
+    # The rounds are unrolled so that the message schedule is resolved at
+    # compile time
+    v = _round(v, (
+        m0, m1, m2, m3, m4, m5, m6, m7,
+        m8, m9, m10, m11, m12, m13, m14, m15
+    ))
+    v = _round(v, (
+        m14, m10, m4, m8, m9, m15, m13, m6,
+        m1, m12, m0, m2, m11, m7, m5, m3
+    ))
+    v = _round(v, (
+        m11, m8, m12, m0, m5, m2, m15, m13,
+        m10, m14, m3, m6, m7, m1, m9, m4
+    ))
+    v = _round(v, (
+        m7, m9, m3, m1, m13, m12, m11, m14,
+        m2, m6, m5, m10, m4, m0, m15, m8
+    ))
+    v = _round(v, (
+        m9, m0, m5, m7, m2, m4, m10, m15,
+        m14, m1, m11, m12, m6, m8, m3, m13
+    ))
+    v = _round(v, (
+        m2, m12, m6, m10, m0, m11, m8, m3,
+        m4, m13, m7, m5, m15, m14, m1, m9
+    ))
+    v = _round(v, (
+        m12, m5, m1, m15, m14, m13, m4, m10,
+        m0, m7, m6, m3, m9, m2, m8, m11
+    ))
+    v = _round(v, (
+        m13, m11, m7, m14, m12, m1, m3, m9,
+        m5, m0, m15, m4, m8, m6, m2, m10
+    ))
+    v = _round(v, (
+        m6, m15, m14, m9, m11, m3, m0, m8,
+        m12, m2, m13, m7, m1, m4, m10, m5
+    ))
+    v = _round(v, (
+        m10, m2, m8, m4, m7, m6, m1, m5,
+        m15, m11, m9, m14, m3, m12, m13, m0
+    ))
+    v = _round(v, (
+        m0, m1, m2, m3, m4, m5, m6, m7,
+        m8, m9, m10, m11, m12, m13, m14, m15
+    ))
+    v = _round(v, (
+        m14, m10, m4, m8, m9, m15, m13, m6,
+        m1, m12, m0, m2, m11, m7, m5, m3
+    ))
+
+    # Only the first 8 bytes of the digest are needed
+    return _H0 ^ v[0] ^ v[8]
+
+
+@njit(nogil=True, parallel=True, cache=True)
+def _find_nonce(h, nonce, threshold, iterations, chunks):
+    """
+    Return the index of the first nonce after `nonce` meeting the threshold,
+    or `iterations` if none of them do.
+
+    The nonces are split into `chunks` contiguous ranges searched in
+    parallel. Each range is searched in order and stops at the first nonce
+    meeting the threshold, so the earliest hit across the ranges is the
+    first nonce overall.
+    """
+    chunk_size = (iterations + chunks - 1) // chunks
+    firsts = np.full(chunks, iterations, dtype=np.int64)
+
+    for chunk in prange(chunks):
+        end = min((chunk + 1) * chunk_size, iterations)
+
+        for i in range(chunk * chunk_size, end):
+            work = nonce + np.uint64(i) + np.uint64(1)
+
+            if _work_value(work, h) >= threshold:
+                firsts[chunk] = i
+                break
+
+    return firsts.min()
+
+
+@njit(nogil=True, cache=True)
+def _validate_batch(block_hashes, works, threshold, results):
+    for i in range(len(works)):
+        if _work_value(works[i], block_hashes[i]) >= threshold:
+            results[i] = 1
+
+
+def do_work(block_hash, nonce, threshold, iterations=ITERATION_COUNT):
+    """
+    Perform work on a block PoW, trying `iterations` nonces starting from
+    `nonce + 1`. Return a (nonce, found) tuple where `nonce` is the nonce
+    meeting the threshold if `found` is True, otherwise the last nonce that
+    was tried.
+    """
+    if len(block_hash) != 32:
+        raise TypeError("'block_hash' needs to have a size of exactly 32 bytes")
+
+    first = _find_nonce(
+        np.frombuffer(block_hash, dtype="<u8"), np.uint64(nonce),
+        np.uint64(threshold), iterations, get_num_threads()
+    )
+
+    if first < iterations:
+        return (nonce + first + 1) % (2**64), True
+
+    return (nonce + iterations) % (2**64), False
+
+
+def work_value(block_hash, nonce):
+    """
+    Return the work value for a nonce as an integer
+    """
+    if len(block_hash) != 32:
+        raise TypeError("'block_hash' needs to have a size of exactly 32 bytes")
+
+    return int(
+        _work_value(np.uint64(nonce), np.frombuffer(block_hash, dtype="<u8"))
+    )
+
+
+def validate_batch(block_hashes, works, threshold):
+    """
+    Validate multiple PoWs at once. `block_hashes` contains concatenated
+    32-byte block hashes and `works` the corresponding concatenated 8-byte
+    little-endian nonces. Return bytes containing 1 for each PoW meeting
+    the threshold, otherwise 0.
+    """
+    if len(block_hashes) % 32 != 0:
+        raise TypeError(
+            "'block_hashes' size needs to be a multiple of 32 bytes")
+
+    count = len(block_hashes) // 32
+
+    if len(works) != count * 8:
+        raise TypeError(
+            "'works' needs to have exactly 8 bytes for each block hash")
+
+    results = np.zeros(count, dtype=np.uint8)
+    _validate_batch(
+        np.frombuffer(block_hashes, dtype="<u8").reshape(count, 4),
+        np.frombuffer(works, dtype="<u8"), np.uint64(threshold), results
+    )
+
+    return results.tobytes()
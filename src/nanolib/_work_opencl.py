@@ -0,0 +1,199 @@
+"""
+nanolib._work_opencl
+~~~~~~~~~~~~~~~~~~~~
+
+OpenCL implementation of the NANO proof-of-work used to solve work on a GPU.
+This module requires `pyopencl` and raises an ImportError if it's not
+installed.
+"""
+import threading
+
+import numpy as np
+import pyopencl as cl
+
+# Amount of nonces tried during one do_work() call
+GLOBAL_SIZE = 1 << 20
+
+KERNEL_SOURCE = """
+__constant ulong IV[8] = {
+    0x6a09e667f3bcc908UL, 0xbb67ae8584caa73bUL,
+    0x3c6ef372fe94f82bUL, 0xa54ff53a5f1d36f1UL,
+    0x510e527fade682d1UL, 0x9b05688c2b3e6c1fUL,
+    0x1f83d9abfb41bd6bUL, 0x5be0cd19137e2179UL
+};
+
+__constant uchar SIGMA[12][16] = {
+    { 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15 },
+    { 14, 10, 4, 8, 9, 15, 13, 6, 1, 12, 0, 2, 11, 7, 5, 3 },
+    { 11, 8, 12, 0, 5, 2, 15, 13, 10, 14, 3, 6, 7, 1, 9, 4 },
+    { 7, 9, 3, 1, 13, 12, 11, 14, 2, 6, 5, 10, 4, 0, 15, 8 },
+    { 9, 0, 5, 7, 2, 4, 10, 15, 14, 1, 11, 12, 6, 8, 3, 13 },
+    { 2, 12, 6, 10, 0, 11, 8, 3, 4, 13, 7, 5, 15, 14, 1, 9 },
+    { 12, 5, 1, 15, 14, 13, 4, 10, 0, 7, 6, 3, 9, 2, 8, 11 },
+    { 13, 11, 7, 14, 12, 1, 3, 9, 5, 0, 15, 4, 8, 6, 2, 10 },
+    { 6, 15, 14, 9, 11, 3, 0, 8, 12, 2, 13, 7, 1, 4, 10, 5 },
+    { 10, 2, 8, 4, 7, 6, 1, 5, 15, 11, 9, 14, 3, 12, 13, 0 },
+    { 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15 },
+    { 14, 10, 4, 8, 9, 15, 13, 6, 1, 12, 0, 2, 11, 7, 5, 3 }
+};
+
+#define G(r, i, a, b, c, d)                      \\
+    a = a + b + m[SIGMA[r][2 * i]];              \\
+    d = rotate(d ^ a, (ulong)32);                \\
+    c = c + d;                                   \\
+    b = rotate(b ^ c, (ulong)40);                \\
+    a = a + b + m[SIGMA[r][2 * i + 1]];          \\
+    d = rotate(d ^ a, (ulong)48);                \\
+    c = c + d;                                   \\
+    b = rotate(b ^ c, (ulong)1);
+
+__kernel void nano_work(
+        __constant ulong *block_hash, const ulong nonce,
+        const ulong threshold, __global uint *found,
+        __global ulong *result) {
+    const ulong work = nonce + get_global_id(0) + 1;
+
+    // The message is the nonce followed by the block hash, zero-padded
+    // to a full 128-byte block
+    ulong m[16] = {
+        work, block_hash[0], block_hash[1], block_hash[2], block_hash[3],
+        0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0
+    };
+
+    // Parameter block for an unkeyed 8-byte digest
+    const ulong h0 = IV[0] ^ 0x01010008UL;
+
+    ulong v[16] = {
+        h0, IV[1], IV[2], IV[3], IV[4], IV[5], IV[6], IV[7],
+        IV[0], IV[1], IV[2], IV[3],
+        // Message length is 40 bytes and this is the last block
+        IV[4] ^ 40UL, IV[5], ~IV[6], IV[7]
+    };
+
+    for (int r = 0; r < 12; r++) {
+        G(r, 0, v[0], v[4], v[8], v[12]);
+        G(r, 1, v[1], v[5], v[9], v[13]);
+        G(r, 2, v[2], v[6], v[10], v[14]);
+        G(r, 3, v[3], v[7], v[11], v[15]);
+        G(r, 4, v[0], v[5], v[10], v[15]);
+        G(r, 5, v[1], v[6], v[11], v[12]);
+        G(r, 6, v[2], v[7], v[8], v[13]);
+        G(r, 7, v[3], v[4], v[9], v[14]);
+    }
+
+    // Several work items may find a nonce meeting the threshold; only the
+    // first one to set the flag stores its nonce
+    if ((h0 ^ v[0] ^ v[8]) >= threshold && atomic_cmpxchg(found, 0, 1) == 0) {
+        *result = work;
+    }
+}
+"""
+
+
+def find_device(device_type=cl.device_type.GPU):
+    """
+    Find the first OpenCL device of the given type
+
+    :return: OpenCL device or None if no device could be found
+    """
+    try:
+        platforms = cl.get_platforms()
+    except cl.Error:
+        # No OpenCL platforms are installed
+        return None
+
+    for platform in platforms:
+        try:
+            devices = platform.get_devices(device_type=device_type)
+        except cl.Error:
+            continue
+
+        if devices:
+            return devices[0]
+
+    return None
+
+
+class OpenCLWorkSolver(object):
+    """
+    Solves proof-of-work on the given OpenCL device
+    """
+    def __init__(self, device):
+        self.context = cl.Context([device])
+        self.queue = cl.CommandQueue(self.context)
+        self.kernel = cl.Program(
+            self.context, KERNEL_SOURCE).build().nano_work
+        self.block_hash_buf = cl.Buffer(
+            self.context, cl.mem_flags.READ_ONLY, size=32)
+        self.found_buf = cl.Buffer(
+            self.context, cl.mem_flags.READ_WRITE, size=4)
+        self.result_buf = cl.Buffer(
+            self.context, cl.mem_flags.READ_WRITE, size=8)
+
+    def do_work(self, block_hash, nonce, threshold):
+        """
+        Perform work on a block PoW, trying nonces starting from `nonce + 1`.
+        Return a (nonce, found) tuple where `nonce` is the nonce meeting
+        the threshold if `found` is True, otherwise the last nonce
+        that was tried.
+        """
+        found = np.zeros(1, dtype=np.uint32)
+        result = np.zeros(1, dtype=np.uint64)
+
+        cl.enqueue_copy(
+            self.queue, self.block_hash_buf,
+            np.frombuffer(block_hash, dtype="<u8"))
+        cl.enqueue_copy(self.queue, self.found_buf, found)
+        self.kernel(
+            self.queue, (GLOBAL_SIZE,), None,
+            self.block_hash_buf, np.uint64(nonce), np.uint64(threshold),
+            self.found_buf, self.result_buf)
+        cl.enqueue_copy(self.queue, found, self.found_buf)
+        cl.enqueue_copy(self.queue, result, self.result_buf).wait()
+
+        if found[0]:
+            return int(result[0]), True
+
+        return (nonce + GLOBAL_SIZE) % (2**64), False
+
+
+_solver = None
+
+# The solver's command queue and buffers are shared, so only one thread
+# may use it at a time
+_solver_lock = threading.Lock()
+
+
+def is_available():
+    """
+    Check if a GPU is available for solving proof-of-work
+    """
+    return find_device() is not None
+
+
+def get_solver():
+    """
+    Return the solver for the first available GPU, creating it on the first
+    call
+
+    :raises cl.Error: If the OpenCL context can't be created or the kernel
+                      can't be built
+    """
+    global _solver
+
+    with _solver_lock:
+        if _solver is None:
+            _solver = OpenCLWorkSolver(find_device())
+
+        return _solver
+
+
+def do_work(block_hash, nonce, threshold):
+    """
+    Perform work on a block PoW using the first available GPU.
+    See :meth:`OpenCLWorkSolver.do_work`
+    """
+    solver = get_solver()
+
+    with _solver_lock:
+        return solver.do_work(block_hash, nonce, threshold)
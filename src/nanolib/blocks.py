@@ -118,6 +118,18 @@ def invalidate_work(setter):
     return wrapper
 
 
+def invalidate_block_hash(setter):
+    """
+    Invalidate the cached value for `block_hash` when the setter is called
+    """
+    @wraps(setter)
+    def wrapper(self, val):
+        self._block_hash = None
+        setter(self, val)
+
+    return wrapper
+
+
 def balance_to_hex(balance):
     """Convert a NANO balance to a 16-character hex string used in
     serialized legacy send blocks
@@ -206,7 +218,8 @@ class Block(object):
     __slots__ = (
         "_block_type", "_account", "_previous", "_destination",
         "_representative", "_balance", "_source", "_link", "_signature",
-        "_work", "_difficulty", "_has_valid_signature", "_has_valid_work"
+        "_work", "_difficulty", "_has_valid_signature", "_has_valid_work",
+        "_block_hash"
     )
 
     def __init__(self, block_type, verify=True, difficulty=None, **kwargs):
@@ -235,6 +248,7 @@ class Block(object):
         """
         self._has_valid_signature = None
         self._has_valid_work = None
+        self._block_hash = None
         self.block_type = block_type
 
         # Set None as default value for all parameters except block_type
@@ -326,7 +340,7 @@ class Block(object):
 
         return True
 
-    def solve_work(self, difficulty=None, timeout=None):
+    def solve_work(self, difficulty=None, timeout=None, workers=1):
         """Solve the work contained in this block and update the Block
         instance to include the work
 
@@ -338,6 +352,8 @@ class Block(object):
                         if the work can't be solved in the given time.
                         If None, the function will block until the work is solved.
         :type timeout: int, float or None
+        :param int workers: Amount of threads used to solve the work on the
+                            CPU. Use `os.cpu_count()` to use every CPU core.
         :return: True if the work was solved in the given time, False otherwise
         :rtype: bool
         """
@@ -355,7 +371,7 @@ class Block(object):
 
         result = solve_work(
             block_hash=self.work_block_hash, difficulty=difficulty,
-            timeout=timeout)
+            timeout=timeout, workers=workers)
 
         if result:
             self.work = result
@@ -637,6 +653,12 @@ class Block(object):
         :return: Block hash as a 64-character hex string
         :rtype: str
         """
+        if self._block_hash is None:
+            self._block_hash = self._calculate_block_hash()
+
+        return self._block_hash
+
+    def _calculate_block_hash(self):
         if self.block_type == "receive":
             return blake2b(
                 b"".join([
@@ -701,6 +723,7 @@ class Block(object):
 
     @block_parameter
     @invalidate_signature
+    @invalidate_block_hash
     def set_block_type(self, block_type):
         if block_type not in BLOCK_TYPES:
             raise ValueError("Block type is not valid")
@@ -709,6 +732,7 @@ class Block(object):
 
     @block_parameter
     @invalidate_signature
+    @invalidate_block_hash
     @invalidate_work
     def set_account(self, account):
         if account is not None:
@@ -717,6 +741,7 @@ class Block(object):
 
     @block_parameter
     @invalidate_signature
+    @invalidate_block_hash
     @invalidate_work
     def set_source(self, source):
         if source is not None:
@@ -733,6 +758,7 @@ class Block(object):
 
     @block_parameter
     @invalidate_signature
+    @invalidate_block_hash
     @invalidate_work
     def set_previous(self, previous):
         if previous is not None:
@@ -750,6 +776,7 @@ class Block(object):
 
     @block_parameter
     @invalidate_signature
+    @invalidate_block_hash
     def set_destination(self, destination):
         if destination is not None:
             validate_account_id(destination)
@@ -757,6 +784,7 @@ class Block(object):
 
     @block_parameter
     @invalidate_signature
+    @invalidate_block_hash
     def set_representative(self, representative):
         if representative is not None:
             validate_account_id(representative)
@@ -764,6 +792,7 @@ class Block(object):
 
     @block_parameter
     @invalidate_signature
+    @invalidate_block_hash
     def set_balance(self, balance):
         if balance is not None:
             validate_balance(balance)
@@ -771,6 +800,7 @@ class Block(object):
 
     @block_parameter
     @invalidate_signature
+    @invalidate_block_hash
     def set_link(self, link):
         if link is not None:
             self._link = unhexlify(validate_block_hash(link).encode("utf-8"))
@@ -785,6 +815,7 @@ class Block(object):
 
     @block_parameter
     @invalidate_signature
+    @invalidate_block_hash
     def set_link_as_account(self, link_as_account):
         if link_as_account is not None:
             self._link = unhexlify(
@@ -55,7 +55,7 @@ getcontext().traps[Inexact] = 1
 
 
 __all__ = (
-    "convert", "NanoDenomination", "NANO_RAW_CAP",
+    "convert", "converter", "NanoDenomination", "NANO_RAW_CAP",
 )
 
 
@@ -100,6 +100,29 @@ NANO_RAW_AMOUNTS = {
 }
 
 
+# Raw amounts keyed by both the NanoDenomination members and their values,
+# so that the denominations don't need to be parsed on every conversion
+_RAW_AMOUNTS_BY_DENOMINATION = {
+    **NANO_RAW_AMOUNTS,
+    **{
+        denomination: NANO_RAW_AMOUNTS[denomination.value]
+        for denomination in NanoDenomination
+    }
+}
+
+
+def _get_raw_amount(denomination):
+    """Return the amount of raw in one unit of the given denomination
+
+    :raises ValueError: If the denomination is invalid
+    """
+    try:
+        return _RAW_AMOUNTS_BY_DENOMINATION[denomination]
+    except (KeyError, TypeError):
+        # Raise the same error as an invalid NanoDenomination would
+        return NANO_RAW_AMOUNTS[NanoDenomination(denomination).value]
+
+
 def _forbid_float(func):
     """Decorator that only allows an integer or a Decimal as the first argument
     """
@@ -133,12 +156,36 @@ def convert(amount, source, target):
     :return: Converted amount
     :rtype: decimal.Decimal
     """
-    source = NanoDenomination(source)
-    target = NanoDenomination(target)
+    return _convert_raw_amount(
+        amount, _get_raw_amount(source), _get_raw_amount(target)
+    )
+
+
+def converter(source, target):
+    """Return a function converting amounts from one denomination to another
+
+    The denominations are only resolved once, which makes this faster than
+    calling :func:`convert` repeatedly when converting a large amount of
+    values between the same denominations.
+
+    :param NanoDenomination source: The denomination to convert from
+    :param NanoDenomination target: The denomination to convert to
+    :raises ValueError: If either denomination is invalid
+    :return: A function taking the amount to convert and behaving like
+             :func:`convert`
+    :rtype: callable
+    """
+    raw_source = _get_raw_amount(source)
+    raw_target = _get_raw_amount(target)
+
+    @_forbid_float
+    def _converter(amount):
+        return _convert_raw_amount(amount, raw_source, raw_target)
+
+    return _converter
 
-    raw_source = NANO_RAW_AMOUNTS[source.value]
-    raw_target = NANO_RAW_AMOUNTS[target.value]
 
+def _convert_raw_amount(amount, raw_source, raw_target):
     # Convert first into raw, then into the target denomination
     raw_amount = amount * raw_source
 
@@ -43,8 +43,10 @@ def bytes_to_nbase32(b):
 
 
 def is_hex(h):
+    # binascii.Error is raised for invalid hex digits, and ValueError for
+    # non-ASCII strings
     try:
         binascii.unhexlify(h)
         return True
-    except binascii.Error:
+    except ValueError:
         return False
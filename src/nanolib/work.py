@@ -1,39 +1,126 @@
+import functools
 import importlib
-import random
+import os
+import threading
 import time
-from binascii import hexlify, unhexlify
-from hashlib import blake2b
-
-import cpuinfo
+from binascii import unhexlify
+from decimal import Decimal
+from fractions import Fraction
 
 from .exceptions import InvalidDifficulty, InvalidMultiplier, InvalidWork
 from .util import dec_to_hex, is_hex
 
 # Select the PoW C extension depending on highest supported instruction set
 # based on the following priorities:
-# AVX > SSE4.1 > SSSE3 > SSE2 > reference implementation
+# AVX-512 > AVX2 > AVX > SSE4.1 > SSSE3 > SSE2 > reference implementation
 #
-# This based on a Ryzen 1800X giving the following results:
-# avx speed: 6185344 hashes/s (this is likely the fastest on Intel CPUs)
-# sse4_1 speed: 6259267 hashes/s
-# ssse3 speed: 6249287 hashes/s
-# sse2 speed: 4635929 hashes/s
-# ref speed: 4539306 hashes/s
+# The AVX-512 and AVX2 implementations hash eight and four nonces at once
+# respectively and are considerably faster than the rest, which use a scalar
+# BLAKE2b compression specialized for the PoW message. The remaining
+# implementations only differ by the instruction sets the compiler is allowed
+# to use.
 
 # TODO: Maybe run a short benchmark when running solve_work() for the first
 #       time?
-_cpu_flags = cpuinfo.get_cpu_info()["flags"]
-_cpu_flags_by_priority = ("avx", "sse4_1", "ssse3", "sse2", "neon", "ref")
-
-for cpu_flag in _cpu_flags_by_priority:
-    if cpu_flag == "ref":
-        _work = importlib.import_module("nanolib._work_ref")
-        break
-    elif cpu_flag in _cpu_flags:
-        _work = importlib.import_module(
-            "nanolib._work_{}".format(cpu_flag)
-        )
-        break
+_cpu_flags_by_priority = (
+    "avx512f", "avx2", "avx", "sse4_1", "ssse3", "sse2", "neon", "ref"
+)
+
+
+def _parse_proc_cpuinfo(path="/proc/cpuinfo"):
+    """Return a dict of the instruction sets listed in `/proc/cpuinfo`.
+    Only used if the `_cpuid` extension isn't available.
+    """
+    flags = set()
+
+    try:
+        with open(path) as f:
+            for line in f:
+                key, _, value = line.partition(":")
+
+                # x86 CPUs list their flags under 'flags', ARM CPUs under
+                # 'Features'
+                if key.strip() in ("flags", "Features"):
+                    flags.update(value.split())
+    except OSError:
+        pass
+
+    # 64-bit ARM CPUs report NEON as 'asimd'
+    if "asimd" in flags:
+        flags.add("neon")
+
+    return {
+        cpu_flag: cpu_flag in flags
+        for cpu_flag in _cpu_flags_by_priority if cpu_flag != "ref"
+    }
+
+
+def _get_cpu_flags():
+    """Return a dict of the instruction sets supported by the CPU"""
+    try:
+        from nanolib import _cpuid
+    except ImportError:
+        return _parse_proc_cpuinfo()
+
+    return _cpuid.features()
+
+
+def _get_supported_isas():
+    """Return the names of the PoW implementations supported by the CPU,
+    fastest first.
+
+    The implementation can be forced using the `NANOLIB_WORK_ISA` environment
+    variable, eg. `NANOLIB_WORK_ISA=avx2`. `NANOLIB_WORK_ISA=numba` forces
+    the Numba implementation.
+    """
+    forced_flag = os.environ.get("NANOLIB_WORK_ISA")
+
+    if forced_flag:
+        choices = _cpu_flags_by_priority + ("numba",)
+
+        if forced_flag not in choices:
+            raise ValueError(
+                "Unknown PoW implementation '{}' in NANOLIB_WORK_ISA, "
+                "expected one of: {}".format(forced_flag, ", ".join(choices))
+            )
+
+        return (forced_flag,)
+
+    cpu_flags = _get_cpu_flags()
+
+    return tuple(
+        cpu_flag for cpu_flag in _cpu_flags_by_priority
+        if cpu_flag == "ref" or cpu_flags.get(cpu_flag)
+    )
+
+
+def _load_best_work():
+    """Import and return the fastest PoW implementation that is supported by
+    the CPU. If the C extension for an instruction set wasn't built, the next
+    fastest one is tried instead.
+    """
+    for cpu_flag in _get_supported_isas():
+        if cpu_flag == "numba":
+            break
+
+        try:
+            return importlib.import_module("nanolib._work_{}".format(cpu_flag))
+        except ImportError:
+            pass
+
+    # The C extensions haven't been built; use the slower Numba
+    # implementation if `numba` is installed
+    from nanolib import _work_numba
+
+    return _work_numba
+
+
+_work = _load_best_work()
+
+# The OpenCL PoW implementation is loaded on demand, since importing pyopencl
+# and probing for GPUs is slow
+_work_gpu = None
+_work_gpu_loaded = False
 
 
 WORK_DIFFICULTY = "fffffff800000000"
@@ -41,7 +128,8 @@ WORK_DIFFICULTY_INT = int(WORK_DIFFICULTY, 16)
 
 
 __all__ = (
-    "WORK_DIFFICULTY", "parse_work", "validate_work", "validate_difficulty",
+    "WORK_DIFFICULTY", "parse_work", "validate_work", "validate_work_batch",
+    "validate_difficulty",
     "derive_work_difficulty", "derive_work_multiplier",
     "get_work_value", "solve_work"
 )
@@ -93,13 +181,7 @@ def get_work_value(block_hash, work, as_hex=False):
     validate_block_hash(block_hash)
     parse_work(work)
 
-    reversed_work = bytearray(unhexlify(work))
-    reversed_work.reverse()
-    work_hash = bytearray(blake2b(
-        b"".join([reversed_work, unhexlify(block_hash)]),
-        digest_size=8).digest())
-    work_hash.reverse()
-    work_value = int(hexlify(work_hash), 16)
+    work_value = _work.work_value(unhexlify(block_hash), int(work, 16))
 
     if as_hex:
         work_value = dec_to_hex(work_value, 8).lower()
@@ -130,6 +212,48 @@ def validate_work(block_hash, work, difficulty=WORK_DIFFICULTY):
     return work.lower()
 
 
+def validate_work_batch(block_hashes, works, difficulty=WORK_DIFFICULTY):
+    """Validate the proof-of-work for multiple block hashes at once.
+
+    This is faster than calling :func:`nanolib.work.validate_work`
+    for each block hash separately when validating a large amount of blocks.
+
+    :param block_hashes: Block hashes as 64-character hex strings
+    :type block_hashes: list of str
+    :param works: Works as 16-character hex strings, one for each block hash
+    :type works: list of str
+    :param str difficulty: The difficulty for the proof-of-work
+                           as a 16-character hex string.
+                           NANO network's difficulty is used by default.
+    :raises InvalidWork: If any work isn't a 16-character hex string
+    :raises InvalidBlockHash: If any block hash isn't a 64-character hex
+                              string
+    :raises ValueError: If the amount of block hashes and works differ
+    :return: A list of booleans, True for each work that meets the difficulty
+    :rtype: list of bool
+    """
+    # Import is deferred to avoid a circular import
+    from nanolib.blocks import validate_block_hash
+
+    if len(block_hashes) != len(works):
+        raise ValueError("Amount of block hashes and works has to be equal")
+
+    difficulty = parse_difficulty(difficulty)
+
+    block_hashes_b = b"".join(
+        unhexlify(validate_block_hash(block_hash))
+        for block_hash in block_hashes
+    )
+    works_b = b"".join(
+        int(parse_work(work), 16).to_bytes(8, byteorder="little")
+        for work in works
+    )
+
+    results = _work.validate_batch(block_hashes_b, works_b, difficulty)
+
+    return [bool(result) for result in results]
+
+
 def validate_difficulty(difficulty):
     """Validate the work difficulty.
 
@@ -155,25 +279,43 @@ def parse_difficulty(difficulty):
     :return: The work difficulty as an integer
     :rtype: int
     """
-    if is_hex(difficulty) and len(difficulty) == 16:
+    try:
+        return _parse_difficulty_cached(difficulty)
+    except TypeError:
+        # Unhashable values such as bytearrays can't be cached
+        return _parse_difficulty(difficulty)
+
+
+def _parse_difficulty(difficulty):
+    if len(difficulty) == 16 and is_hex(difficulty):
         return int(difficulty, 16)
 
     raise InvalidDifficulty("Difficulty has to be a 16-character hex string")
 
 
+# Only a handful of different difficulties are used at any time, so the
+# parsed values are cached
+_parse_difficulty_cached = functools.lru_cache(maxsize=64)(_parse_difficulty)
+
+
 def derive_work_difficulty(multiplier, base_difficulty=None):
     """Derive the work difficulty from a provided multiplier
     and a base difficulty
 
-    :param float multiplier: Work multiplier as a float. Work difficulty with
-                             a multiplier of 2 requires on average twice as
-                             much work compared to the base difficulty.
+    :param multiplier: Work multiplier as a float. Work difficulty with
+                       a multiplier of 2 requires on average twice as
+                       much work compared to the base difficulty.
+                       A string, :class:`decimal.Decimal` or
+                       :class:`fractions.Fraction` is used as-is
+                       without rounding it to a float.
+    :type multiplier: float, str, decimal.Decimal or fractions.Fraction
     :param str base_difficulty: Base difficulty as a 16-character hex string.
                                 NANO network's difficulty is used by default.
     :raises InvalidDifficulty: If the difficulty isn't a 16-character hex
                                string
-    :raises ValueError: If the resulting difficulty is larger than \
-                        :math:`2^{64}-1`
+    :raises InvalidMultiplier: If the multiplier isn't a positive finite
+                               float
+    :raises ValueError: If the resulting difficulty is smaller than 0
     :return: The adjusted work difficulty as a 16-character hex string
     :rtype: str
     """
@@ -182,19 +324,36 @@ def derive_work_difficulty(multiplier, base_difficulty=None):
     else:
         base_difficulty = parse_difficulty(base_difficulty)
 
+    if not isinstance(multiplier, (int, float, str, Decimal, Fraction)):
+        try:
+            multiplier = float(multiplier)
+        except (TypeError, ValueError):
+            raise InvalidMultiplier("Multiplier is not a float")
+
     try:
-        multiplier = float(multiplier)
+        # Fraction represents the multiplier exactly, allowing the difficulty
+        # to be calculated using integers only. Strings and decimals are
+        # parsed directly so that eg. "1.1" isn't rounded to a float first.
+        multiplier = Fraction(multiplier)
     except ValueError:
-        raise InvalidMultiplier("Multiplier is not a float")
+        if isinstance(multiplier, str):
+            raise InvalidMultiplier("Multiplier is not a float")
+
+        raise InvalidMultiplier("Multiplier has to be a finite float")
+    except OverflowError:
+        raise InvalidMultiplier("Multiplier has to be a finite float")
 
     if multiplier <= 0:
         raise InvalidMultiplier(
             "Multiplier has to be a positive non-zero float")
 
-    difficulty = int((base_difficulty - (1 << 64)) / multiplier + (1 << 64))
+    difficulty = (
+        (base_difficulty - (1 << 64)) * multiplier.denominator
+        // multiplier.numerator
+    ) + (1 << 64)
 
-    if difficulty > (2**64)-1:
-        raise ValueError("Resulting difficulty is too large")
+    if difficulty < 0:
+        raise ValueError("Resulting difficulty is too small")
 
     return dec_to_hex(difficulty, 8).lower()
 
@@ -219,14 +378,44 @@ def derive_work_multiplier(difficulty, base_difficulty=None):
 
     difficulty = parse_difficulty(difficulty)
 
-    multiplier = \
-        float((1 << 64) - base_difficulty) / float((1 << 64) - difficulty)
-    return multiplier
+    # Divide the integers exactly and round only the final result
+    return float(
+        Fraction((1 << 64) - base_difficulty, (1 << 64) - difficulty))
+
+
+def _get_gpu_work():
+    """Return the OpenCL PoW implementation if `pyopencl` is installed and
+    a GPU is available, otherwise return None
+    """
+    global _work_gpu, _work_gpu_loaded
+
+    if not _work_gpu_loaded:
+        _work_gpu_loaded = True
+
+        try:
+            from nanolib import _work_opencl
+        except ImportError:
+            return None
+
+        # A broken OpenCL driver or a GPU that can't build the kernel
+        # shouldn't prevent solving the work on the CPU
+        try:
+            if _work_opencl.is_available():
+                _work_opencl.get_solver()
+                _work_gpu = _work_opencl
+        except (_work_opencl.cl.Error, RuntimeError):
+            pass
+
+    return _work_gpu
 
 
-def solve_work(block_hash, difficulty=WORK_DIFFICULTY, timeout=None):
+def solve_work(block_hash, difficulty=WORK_DIFFICULTY, timeout=None,
+               use_gpu=True, workers=1):
     """Solve the work for the corresponding block hash.
 
+    .. note:: If `pyopencl` is installed and a GPU is available, the work
+              is solved on the GPU by default.
+
     :param str block_hash: Block hash as a 64-character hex string
     :param str difficulty: The difficulty for the proof-of-work as a
                            16-character hex string.
@@ -235,31 +424,97 @@ def solve_work(block_hash, difficulty=WORK_DIFFICULTY, timeout=None):
                     if the work can't be solved in the given time.
                     If None, the function will block until the work is solved.
     :type timeout: int, float or None
+    :param bool use_gpu: Whether to solve the work using a GPU if one is
+                         available
+    :param int workers: Amount of threads used to solve the work on the CPU.
+                        Use `os.cpu_count()` to use every CPU core.
+                        Ignored if the work is solved on a GPU or using
+                        Numba, both of which search in parallel already.
+    :raises ValueError: If `workers` is smaller than 1
     :return: The solved work as a 64-character hex string or None
              couldn't be solved in time
     :rtype: str or None
     """
-    validate_difficulty(difficulty)
+    difficulty = parse_difficulty(difficulty)
 
-    # Reinitialize the random number generator in case this method is being
-    # run in a multiprocessing environment; otherwise every process will
-    # inherit the same RNG state
-    random.seed()
+    if workers < 1:
+        raise ValueError("Amount of workers has to be at least 1")
 
-    nonce = random.randint(0, (2**64)-1)
+    # Use the OS random number generator for the starting nonce; unlike
+    # 'random', its state isn't inherited by forked processes
+    nonce = int.from_bytes(os.urandom(8), byteorder="little")
     block_hash_b = unhexlify(block_hash)
 
-    start = time.time()
+    work_impl = use_gpu and _get_gpu_work()
 
-    while True:
-        nonce = _work.do_work(
-            block_hash_b, nonce, parse_difficulty(difficulty))
-        work = hexlify(int(nonce).to_bytes(8, byteorder="big"))
-        try:
-            validate_work(block_hash, work, difficulty)
-            return str(work, "utf-8")
-        except InvalidWork:
-            pass
+    if work_impl:
+        workers = 1
+    else:
+        work_impl = _work
 
-        if timeout and (time.time() - start) > timeout:
-            return None
+        # The Numba implementation already searches on multiple threads
+        if getattr(work_impl, "MULTITHREADED", False):
+            workers = 1
+
+    # Look up the PoW function only once instead of on every iteration
+    do_work = work_impl.do_work
+
+    # The clock is only checked between do_work() calls, each of which
+    # tries a large batch of nonces. A monotonic clock keeps the timeout
+    # unaffected by changes to the system time.
+    deadline = time.monotonic() + timeout if timeout else None
+    stop = threading.Event()
+
+    def search(nonce):
+        while not stop.is_set():
+            nonce, found = do_work(block_hash_b, nonce, difficulty)
+
+            if found:
+                stop.set()
+
+                # The PoW implementations only return nonces meeting the
+                # difficulty; check the result once in case of a broken
+                # implementation
+                if _work.work_value(block_hash_b, nonce) < difficulty:
+                    raise RuntimeError(
+                        "PoW implementation returned work that doesn't "
+                        "meet the difficulty"
+                    )
+
+                return "{:016x}".format(nonce)
+
+            if deadline is not None and time.monotonic() > deadline:
+                return None
+
+        return None
+
+    if workers == 1:
+        return search(nonce)
+
+    # Import is deferred since concurrent.futures is slow to import and
+    # only needed when solving with multiple threads
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    # The PoW implementations release the GIL, so the threads can search
+    # disjoint nonce ranges in parallel. The first thread to find the work
+    # tells the rest to stop.
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            futures = [
+                executor.submit(
+                    search, (nonce + i * (2**64 // workers)) % 2**64)
+                for i in range(workers)
+            ]
+
+            for future in as_completed(futures):
+                work = future.result()
+
+                if work:
+                    return work
+        finally:
+            # Stop the remaining threads before the executor waits for
+            # them, eg. if the work was found or this thread was
+            # interrupted with a KeyboardInterrupt
+            stop.set()
+
+    return None
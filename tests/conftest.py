@@ -1,22 +1,66 @@
+import copy
+
 import pytest
 
 from nanolib.blocks import Block
 
 from tests.data import BLOCKS
 
+# Use a far lower default difficulty for unit tests
+TEST_DIFFICULTY = "8345468f269004a2"
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    When running the tests in parallel using pytest-xdist with
+    `--dist=loadgroup`, run all tests for the same test block on the same
+    worker
+    """
+    if not config.pluginmanager.hasplugin("xdist"):
+        return
+
+    for item in items:
+        callspec = getattr(item, "callspec", None)
+
+        if callspec and "name" in callspec.params:
+            item.add_marker(
+                pytest.mark.xdist_group(name=callspec.params["name"])
+            )
+
 
 @pytest.fixture(autouse=True)
 def low_pow_difficulty(monkeypatch):
-    # Use a far lower default difficulty for unit tests
-    TEST_DIFFICULTY = "8345468f269004a2"
     monkeypatch.setattr("nanolib.blocks.WORK_DIFFICULTY", TEST_DIFFICULTY)
     monkeypatch.setattr("nanolib.work.WORK_DIFFICULTY", TEST_DIFFICULTY)
     monkeypatch.setattr("nanolib.WORK_DIFFICULTY", TEST_DIFFICULTY)
 
 
 @pytest.fixture(scope="function")
-def block_factory():
-    def _create_func(name):
-        return Block.from_dict(BLOCKS[name]["data"])
+def block_factory(parsed_blocks):
+    def _create_func(name, verify=False):
+        if verify:
+            return Block.from_dict(BLOCKS[name]["data"])
+
+        # Most tests only change the block's attributes, so copy the
+        # already parsed block instead of parsing and validating it again.
+        # A shallow copy is enough since the block's fields are immutable.
+        return copy.copy(parsed_blocks[name])
 
     return _create_func
+
+
+@pytest.fixture(scope="session")
+def parsed_blocks():
+    """
+    Test blocks parsed once for the entire test session. The blocks are
+    shared between tests and must not be modified; tests that change
+    block attributes should use `block_factory` instead.
+    """
+    # Session-scoped fixtures are created before 'low_pow_difficulty'
+    # patches the default difficulty, so pass it explicitly
+    return {
+        name: Block.from_dict(
+            block["data"], verify=False, difficulty=TEST_DIFFICULTY
+        )
+        for name, block in BLOCKS.items()
+    }
@@ -1,30 +1,33 @@
+import os
+import time
 import timeit
-import cpuinfo
+from concurrent.futures import ThreadPoolExecutor
 
 from hashlib import blake2b
 
+from nanolib import _cpuid
 from nanolib.work import _work
 
 
 def run_speed_tests():
     def pow_solve_speed_test():
-        HASHES_PER_ITERATION = 250000
+        HASHES_PER_ITERATION = 1000000
         ITERATIONS = 20
 
         # Get supported CPU instruction sets
-        cpu_flags = cpuinfo.get_cpu_info()["flags"]
+        cpu_flags = _cpuid.features()
 
-        all_flags = ["avx", "sse4_1", "ssse3", "sse2", "neon"]
+        all_flags = ["avx512f", "avx2", "avx", "sse4_1", "ssse3", "sse2", "neon"]
         supported_flags = [
             flag for flag in all_flags
-            if flag in cpu_flags
+            if cpu_flags.get(flag)
         ] + ["ref"]
 
         for flag in supported_flags:
             elapsed = timeit.Timer(
                 ("nonce = 0\n"
                  "while nonce < 1000000:\n"
-                 "    nonce = _work.do_work(block_hash, nonce, (2**64)-1)"),
+                 "    nonce, _ = _work.do_work(block_hash, nonce, (2**64)-1)"),
                 ("from nanolib import _work_{} as _work\n"
                  "from hashlib import blake2b\n"
                  "block_hash = blake2b(\n"
@@ -40,6 +43,41 @@ def run_speed_tests():
                 used=" DEFAULT" if supported_flags.index(flag) == 0 else "",
                 rate=rate))
 
+    def pow_thread_scaling_test():
+        HASHES_PER_THREAD = 5000000
+
+        block_hash = blake2b(b"fakeBlock", digest_size=32).digest()
+
+        def search(nonce):
+            end = nonce + HASHES_PER_THREAD
+
+            while nonce < end:
+                nonce, _ = _work.do_work(block_hash, nonce, (2**64)-1)
+
+        def get_rate(threads):
+            # Each thread searches its own nonce range. The PoW
+            # implementations release the GIL, so the threads should
+            # run in parallel.
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                start = time.perf_counter()
+                list(executor.map(
+                    search,
+                    [i * HASHES_PER_THREAD for i in range(threads)]
+                ))
+                elapsed = time.perf_counter() - start
+
+            return int((HASHES_PER_THREAD * threads) / elapsed)
+
+        threads = os.cpu_count() or 1
+        single_rate = get_rate(1)
+        multi_rate = get_rate(threads)
+
+        print(
+            "BLAKE2b PoW speed using {threads} threads: {rate} hashes/s "
+            "({scaling:.2f}x of a single thread)".format(
+                threads=threads, rate=multi_rate,
+                scaling=multi_rate / single_rate))
+
     def account_gen_speed_test():
         ITERATIONS = 10
 
@@ -101,6 +139,7 @@ def run_speed_tests():
         print("Block verify rate: {} blocks/s".format(rate))
 
     pow_solve_speed_test()
+    pow_thread_scaling_test()
     account_gen_speed_test()
     block_sign_speed_test()
     block_verify_speed_test()
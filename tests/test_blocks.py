@@ -18,43 +18,65 @@ VALID_ACCOUNT_PUBLIC_KEY = \
     "6AB5902B8E71B57F4B7680368ECA010AA658AFFEC3FD00ADB4155DCEE14EFE29"
 
 TEST_BLOCKS = []
+TEST_BLOCKS_JSON = []
 
 for name in BLOCKS.keys():
     TEST_BLOCKS.append((name, BLOCKS[name]))
+    # Serialize the test blocks only once for the JSON deserialization tests
+    TEST_BLOCKS_JSON.append(
+        (name, BLOCKS[name], json.dumps(BLOCKS[name]["data"]))
+    )
 
 
 @pytest.mark.parametrize("name,block", TEST_BLOCKS)
-def test_block_hash(name, block):
+def test_block_hash(name, block, parsed_blocks):
     """
     Calculate block hash for every test block and check that they match
     with the test data
     """
-    correct_block_hash = block["hash"]
-    block = Block.from_dict(block["data"])
+    assert parsed_blocks[name].block_hash == block["hash"]
 
-    assert block.block_hash == correct_block_hash
 
+def test_block_hash_cached(block_factory):
+    """
+    Check that the block hash is cached until a field included in the
+    block hash is changed
+    """
+    block = block_factory("state_sendreceive")
+    block_hash = block.block_hash
 
-@pytest.mark.parametrize("name,block", TEST_BLOCKS)
-def test_block_json(name, block):
+    assert block._block_hash == block_hash
+
+    # Signature and work aren't part of the block hash
+    block.signature = None
+    block.work = None
+    assert block._block_hash == block_hash
+
+    block.balance = 100
+    assert block._block_hash is None
+    assert block.block_hash != block_hash
+
+
+@pytest.mark.parametrize("name,block,block_json", TEST_BLOCKS_JSON)
+def test_block_json(name, block, block_json):
     """
     Deserialize every block from JSON and ensure they can be serialized
     back into identical JSON
     """
+    # The signature and PoW are verified in 'test_block_complete'
     test_block = block["data"]
-    block = Block.from_json(json.dumps(test_block))
+    block = Block.from_json(block_json, verify=False)
 
-    assert json.loads(block.json()) == test_block
+    assert block.to_dict() == test_block
 
 
-@pytest.mark.parametrize("name,block", TEST_BLOCKS)
-def test_block_complete(name, block):
+@pytest.mark.parametrize("name,block,block_json", TEST_BLOCKS_JSON)
+def test_block_complete(name, block, block_json):
     """
     Deserialize every block from JSON and check that they have valid PoW and
     signatures
     """
-    test_block = block["data"]
-    block = Block.from_json(json.dumps(test_block))
+    block = Block.from_json(block_json)
 
     assert block.has_valid_work
 
@@ -90,7 +112,7 @@ def test_block_tx_type():
     Load different blocks and check that their tx_types match
     """
     for block_data, tx_type in BLOCKS_AND_TYPES:
-        block = Block.from_dict(block_data["data"])
+        block = Block.from_dict(block_data["data"], verify=False)
         assert block.tx_type == tx_type, \
             "For block %s, expected tx_type %s, got %s" % (
                 block_data["hash"], tx_type, block.tx_type)
@@ -193,8 +215,7 @@ def test_block_invalid_work(block_factory):
     """
     Try to load a block with invalid work
     """
-    block_data = BLOCKS["receive"]["data"].copy()
-    block_data["work"] = "a"*16
+    block_data = {**BLOCKS["receive"]["data"], "work": "a"*16}
 
     with pytest.raises(InvalidWork):
         Block.from_dict(block_data)
@@ -417,10 +438,7 @@ def test_block_set_balance(block_factory):
     with pytest.raises(InvalidBalance):
         # Pre-state blocks only accept hex balances when deserializing
         # from a dict
-        block_data = BLOCKS["send"]["data"].copy()
-        block_data["balance"] = str(2**128)
-
-        Block.from_dict(block_data)
+        Block.from_dict({**BLOCKS["send"]["data"], "balance": str(2**128)})
 
     # String-formatted balance
     block = block_factory("state_sendreceive")
@@ -442,8 +460,7 @@ def test_block_legacy_send_from_dict():
     """
     When deserializing a legacy send block, the balance has to be hex-formatted
     """
-    block_data = BLOCKS["send"]["data"].copy()
-    block_data["balance"] = "10000000"
+    block_data = {**BLOCKS["send"]["data"], "balance": "10000000"}
 
     with pytest.raises(InvalidBalance) as exc:
         Block.from_dict(block_data)
@@ -518,8 +535,7 @@ def test_block_prohibited_parameters():
     """
     Try to load a block with an additional prohibited parameter
     """
-    block_data = BLOCKS["change"]["data"].copy()
-    block_data["balance"] = "10000"
+    block_data = {**BLOCKS["change"]["data"], "balance": "10000"}
 
     with pytest.raises(InvalidBlock) as exc:
         Block.from_dict(block_data)
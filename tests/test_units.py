@@ -1,7 +1,7 @@
 from decimal import Decimal, Inexact
 
 import pytest
-from nanolib.units import convert, NanoDenomination
+from nanolib.units import convert, converter, NanoDenomination
 
 
 def test_floats_not_allowed():
@@ -115,3 +115,21 @@ def test_inexact_conversion():
             source=NanoDenomination.RAW,
             target=NanoDenomination.MEGANANO
         )
+
+
+def test_converter():
+    to_raw = converter(
+        source=NanoDenomination.MEGANANO, target=NanoDenomination.RAW
+    )
+
+    assert to_raw(Decimal("1.5")) == Decimal("1500000000000000000000000000000")
+    assert to_raw(1) == Decimal("1000000000000000000000000000000")
+
+    with pytest.raises(TypeError):
+        to_raw(1.5)
+
+    with pytest.raises(ValueError):
+        to_raw(Decimal("340282366.920938463463374607431768211456"))
+
+    with pytest.raises(ValueError):
+        converter(source="invalid", target=NanoDenomination.RAW)
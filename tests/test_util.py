@@ -25,6 +25,19 @@ def test_bytes_to_nbase32():
     assert bytes_to_nbase32(b'I\x10\xd0 i') == "b6af1a5b"
 
 
+def test_nbase32_roundtrip():
+    """
+    Encode and decode byte strings of different lengths, including lengths
+    that divide evenly into 5-byte groups
+    """
+    for size in range(1, 41):
+        b = bytes(range(256 - size, 256))
+        nbase32 = bytes_to_nbase32(b)
+
+        assert len(nbase32) == (size * 8 + 4) // 5
+        assert nbase32_to_bytes(nbase32) == b
+
+
 def test_bytes_to_nbase32_empty():
     with pytest.raises(ValueError) as exc:
         bytes_to_nbase32(b"")
@@ -39,3 +52,6 @@ def test_is_hex():
     assert not is_hex("0x00000000000000")
 
     assert not is_hex("aabbccddeeffgg")
+
+    # Non-ASCII characters are rejected instead of raising an exception
+    assert not is_hex("aabbccddeeff\u00e4\u00e4")
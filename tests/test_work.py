@@ -1,13 +1,17 @@
 import time
+from decimal import Decimal
+from fractions import Fraction
 from hashlib import blake2b
 
 import pytest
+from nanolib import _cpuid
 from nanolib.exceptions import (InvalidDifficulty, InvalidMultiplier,
                                 InvalidWork, InvalidBlockHash)
 from nanolib.util import dec_to_hex
 from nanolib.work import (derive_work_difficulty, derive_work_multiplier,
                           parse_difficulty, parse_work, get_work_value,
-                          solve_work, validate_difficulty, validate_work)
+                          solve_work, validate_difficulty, validate_work,
+                          validate_work_batch)
 
 VALID_BLOCK_HASH = \
     "B585D9363B8265CFD5993F30A3D6DE6B5CA5CC7879E0AFA94D13F08B713B9FFD"
@@ -58,6 +62,29 @@ def test_validate_work():
     assert validate_work(block_hash=VALID_BLOCK_HASH, work=VALID_WORK)
 
 
+def test_validate_work_batch():
+    block_hashes = [VALID_BLOCK_HASH, VALID_BLOCK_HASH, "a"*64]
+    works = [VALID_WORK, "e"*16, "f"*16]
+    difficulty = "ffffffc000000000"
+
+    assert validate_work_batch(
+        block_hashes, works, difficulty=difficulty) == [True, False, False]
+    assert validate_work_batch(
+        block_hashes, works, difficulty="0"*16) == [True, True, True]
+
+    assert validate_work_batch([], []) == []
+
+    with pytest.raises(ValueError):
+        # Different amount of block hashes and works
+        validate_work_batch(block_hashes, works[:2])
+
+    with pytest.raises(InvalidWork):
+        validate_work_batch([VALID_BLOCK_HASH], ["a"*17])
+
+    with pytest.raises(InvalidBlockHash):
+        validate_work_batch(["f"*65], [VALID_WORK])
+
+
 def test_validate_difficulty():
     assert validate_difficulty("FFFFFFC000000000") == "ffffffc000000000"
 
@@ -81,6 +108,13 @@ def test_parse_difficulty():
         # Not a 16-character hex string
         parse_difficulty("A"*17)
 
+    # Unhashable values aren't cached, but are still parsed
+    assert parse_difficulty(bytearray(b"FFFFFFC000000000")) == \
+        18446743798831644672
+
+    with pytest.raises(InvalidDifficulty):
+        parse_difficulty(bytearray(b"A"*17))
+
 
 def test_derive_work_difficulty():
     assert derive_work_difficulty(
@@ -105,10 +139,33 @@ def test_derive_work_difficulty():
             multiplier=1, base_difficulty=hex(2**64)[2:]
         )
 
+    with pytest.raises(InvalidMultiplier):
+        # Not a finite float
+        derive_work_difficulty(multiplier=float("inf"))
+
+    # Large multipliers don't lose precision
+    assert derive_work_difficulty(
+        multiplier=268435456, base_difficulty="ffffffc000000000"
+    ) == "fffffffffffffc00"
+
     with pytest.raises(ValueError):
-        # Resulting difficulty is too large
+        # Resulting difficulty is too small
         derive_work_difficulty(
-            multiplier=268435456, base_difficulty="ffffffc000000000")
+            multiplier=2**-40, base_difficulty="ffffffc000000000")
+
+    # Strings, decimals and fractions aren't rounded to a float
+    for multiplier in ("1.1", "11/10", Decimal("1.1"), Fraction(11, 10)):
+        assert derive_work_difficulty(
+            multiplier=multiplier, base_difficulty="0000000000000000"
+        ) == "1745d1745d1745d1"
+
+    assert derive_work_difficulty(
+        multiplier=1.1, base_difficulty="0000000000000000"
+    ) == "1745d1745d174b1b"
+
+    with pytest.raises(InvalidMultiplier):
+        # Not a finite decimal
+        derive_work_difficulty(multiplier=Decimal("Infinity"))
 
 
 def test_derive_work_multiplier():
@@ -119,6 +176,11 @@ def test_derive_work_multiplier():
         difficulty="ffffffe000000000", base_difficulty="ffffffc000000000"
     ) == pytest.approx(2)
 
+    # The division is exact and only the result is rounded
+    assert derive_work_multiplier(
+        difficulty="fffffffffffffc00", base_difficulty="ffffffc000000000"
+    ) == 268435456
+
     # 'base_difficulty' defaults to 'fffffff800000000'
     assert derive_work_multiplier(difficulty="fffffff800000000") == 1
 
@@ -142,6 +204,280 @@ def test_solve_work():
     assert validate_work(fake_hash, work=result, difficulty=test_difficulty)
 
 
+def test_solve_work_workers():
+    """
+    Solve work using multiple threads
+    """
+    fake_hash = blake2b(b"fakeBlock", digest_size=32).hexdigest()
+    test_difficulty = "ffff000000000000"
+
+    result = solve_work(
+        fake_hash, difficulty=test_difficulty, use_gpu=False, workers=4)
+
+    assert validate_work(fake_hash, work=result, difficulty=test_difficulty)
+
+    # Every thread gives up once the timeout is reached
+    assert solve_work(
+        fake_hash, difficulty="f"*16, timeout=0.1, use_gpu=False,
+        workers=2) is None
+
+    with pytest.raises(ValueError) as exc:
+        solve_work(fake_hash, difficulty=test_difficulty, workers=0)
+
+    assert "Amount of workers has to be at least 1" in str(exc.value)
+
+
+def test_solve_work_workers_interrupted(monkeypatch):
+    """
+    Check that the threads are stopped if waiting for them is interrupted
+    """
+    import concurrent.futures
+
+    def interrupted_as_completed(futures):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(
+        concurrent.futures, "as_completed", interrupted_as_completed)
+
+    fake_hash = blake2b(b"fakeBlock", digest_size=32).hexdigest()
+
+    # Without a timeout, the threads would never stop on their own
+    with pytest.raises(KeyboardInterrupt):
+        solve_work(fake_hash, difficulty="f"*16, use_gpu=False, workers=2)
+
+
+def test_solve_work_workers_numba():
+    """
+    Check that the Numba implementation isn't called from multiple threads,
+    which aborts the process with Numba's default threading layer
+    """
+    import os
+    import subprocess
+    import sys
+
+    pytest.importorskip("numba")
+
+    env = dict(
+        os.environ, NANOLIB_WORK_ISA="numba",
+        NUMBA_THREADING_LAYER="workqueue"
+    )
+    code = (
+        "from nanolib.work import solve_work\n"
+        "print(solve_work({!r}, difficulty='fff0000000000000', "
+        "use_gpu=False, workers=4))".format(
+            blake2b(b"fakeBlock", digest_size=32).hexdigest()
+        )
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-c", code], env=env, stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE, universal_newlines=True, timeout=300
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert len(result.stdout.strip()) == 16
+
+
+def test_supported_work_implementations(monkeypatch):
+    """
+    Check that the PoW implementation can be forced using an environment
+    variable
+    """
+    from nanolib.work import _get_supported_isas
+
+    monkeypatch.delenv("NANOLIB_WORK_ISA", raising=False)
+    assert _get_supported_isas()[0] in (
+        "avx512f", "avx2", "avx", "sse4_1", "ssse3", "sse2", "neon", "ref")
+    assert _get_supported_isas()[-1] == "ref"
+
+    monkeypatch.setenv("NANOLIB_WORK_ISA", "ref")
+    assert _get_supported_isas() == ("ref",)
+
+    monkeypatch.setenv("NANOLIB_WORK_ISA", "mmx")
+    with pytest.raises(ValueError) as exc:
+        _get_supported_isas()
+
+    assert "Unknown PoW implementation 'mmx'" in str(exc.value)
+
+
+def test_load_best_work_implementation(monkeypatch):
+    """
+    Check that the next fastest PoW implementation is loaded if the C
+    extension for an instruction set is missing
+    """
+    import importlib
+    from nanolib import work
+
+    import_module = importlib.import_module
+
+    def mock_import_module(name):
+        if name in ("nanolib._work_avx512f", "nanolib._work_avx2"):
+            raise ImportError("No module named '{}'".format(name))
+
+        return import_module(name)
+
+    monkeypatch.delenv("NANOLIB_WORK_ISA", raising=False)
+    monkeypatch.setattr(
+        work, "_get_cpu_flags",
+        lambda: {"avx512f": True, "avx2": True, "avx": False, "sse4_1": True}
+    )
+    monkeypatch.setattr(work.importlib, "import_module", mock_import_module)
+
+    assert work._load_best_work().__name__ == "nanolib._work_sse4_1"
+
+
+def test_parse_proc_cpuinfo(tmp_path):
+    """
+    Parse supported instruction sets from /proc/cpuinfo, which is used
+    if the cpuid extension isn't available
+    """
+    from nanolib.work import _parse_proc_cpuinfo
+
+    x86_cpuinfo = tmp_path / "x86_cpuinfo"
+    x86_cpuinfo.write_text(
+        "processor\t: 0\n"
+        "flags\t\t: fpu sse sse2 ssse3 sse4_1 sse4_2 avx\n"
+    )
+    arm_cpuinfo = tmp_path / "arm_cpuinfo"
+    arm_cpuinfo.write_text(
+        "processor\t: 0\n"
+        "Features\t: fp asimd evtstrm crc32\n"
+    )
+
+    assert _parse_proc_cpuinfo(str(x86_cpuinfo)) == {
+        "avx512f": False, "avx2": False, "avx": True, "sse4_1": True,
+        "ssse3": True, "sse2": True, "neon": False
+    }
+    assert _parse_proc_cpuinfo(str(arm_cpuinfo))["neon"]
+    assert not any(
+        _parse_proc_cpuinfo(str(tmp_path / "nonexistent")).values())
+
+
+@pytest.fixture(scope="module")
+def cpu_flags():
+    return _cpuid.features()
+
+
+@pytest.mark.parametrize(
+    "cpu_flag",
+    ["avx512f", "avx2", "avx", "sse4_1", "ssse3", "sse2", "neon", "ref",
+     "numba"]
+)
+def test_work_implementation(cpu_flags, cpu_flag):
+    """
+    Solve work using every PoW implementation supported by the CPU and
+    check that the first nonce meeting the difficulty is returned
+    """
+    if cpu_flag not in ("ref", "numba") and not cpu_flags.get(cpu_flag):
+        pytest.skip("CPU doesn't support {}".format(cpu_flag))
+
+    work_impl = pytest.importorskip("nanolib._work_{}".format(cpu_flag))
+
+    block_hash = blake2b(b"fakeBlock", digest_size=32).hexdigest()
+    block_hash_b = bytes.fromhex(block_hash)
+    difficulty = int("f000000000000000", 16)
+
+    def work_value(nonce):
+        return get_work_value(block_hash, "{:016x}".format(nonce))
+
+    for start in (0, 1000, 2**64 - 100):
+        nonce, found = work_impl.do_work(block_hash_b, start, difficulty)
+
+        assert found
+        assert work_value(nonce) >= difficulty
+        assert all(
+            work_value(candidate % 2**64) < difficulty
+            for candidate in range(start + 1, start + 1 + (
+                (nonce - start - 1) % 2**64))
+        )
+
+    # The last nonce that was tried is returned if no work was found
+    assert work_impl.do_work(block_hash_b, 5000, 2**64 - 1, 256) == \
+        (5256, False)
+
+    assert work_impl.work_value(block_hash_b, nonce) == work_value(nonce)
+
+    works = [nonce, 1, 2]
+    assert work_impl.validate_batch(
+        block_hash_b * 3,
+        b"".join(work.to_bytes(8, byteorder="little") for work in works),
+        difficulty
+    ) == bytes(int(work_value(work) >= difficulty) for work in works)
+
+
+def test_solve_work_opencl(monkeypatch):
+    """
+    Solve work using the OpenCL implementation on any available OpenCL device
+    """
+    cl = pytest.importorskip("pyopencl")
+    from nanolib import _work_opencl
+
+    device = _work_opencl.find_device(cl.device_type.ALL)
+
+    if not device:
+        pytest.skip("No OpenCL devices available")
+
+    solver = _work_opencl.OpenCLWorkSolver(device)
+    monkeypatch.setattr("nanolib.work._get_gpu_work", lambda: solver)
+
+    fake_hash = blake2b(b"fakeBlock", digest_size=32).hexdigest()
+    test_difficulty = "fff0000000000000"
+
+    result = solve_work(fake_hash, difficulty=test_difficulty)
+
+    assert validate_work(fake_hash, work=result, difficulty=test_difficulty)
+
+    # Every work item meets the lowest difficulty; exactly one of them
+    # should publish its nonce
+    nonce, found = solver.do_work(bytes.fromhex(fake_hash), 1000, 1)
+
+    assert found
+    assert 1000 < nonce <= 1000 + _work_opencl.GLOBAL_SIZE
+
+
+def test_solve_work_opencl_broken(monkeypatch):
+    """
+    Check that the work is solved on the CPU if the OpenCL solver can't be
+    created
+    """
+    pytest.importorskip("pyopencl")
+    from nanolib import _work_opencl
+
+    def get_solver():
+        raise RuntimeError("Kernel build failed")
+
+    monkeypatch.setattr(_work_opencl, "is_available", lambda: True)
+    monkeypatch.setattr(_work_opencl, "get_solver", get_solver)
+    monkeypatch.setattr("nanolib.work._work_gpu", None)
+    monkeypatch.setattr("nanolib.work._work_gpu_loaded", False)
+
+    fake_hash = blake2b(b"fakeBlock", digest_size=32).hexdigest()
+    test_difficulty = "fff0000000000000"
+
+    result = solve_work(fake_hash, difficulty=test_difficulty)
+
+    assert validate_work(fake_hash, work=result, difficulty=test_difficulty)
+
+
+def test_solve_work_broken_implementation(monkeypatch):
+    """
+    Check that work returned by a broken PoW implementation isn't accepted
+    """
+    class BrokenWork:
+        @staticmethod
+        def do_work(block_hash, nonce, threshold):
+            return 1, True
+
+    monkeypatch.setattr("nanolib.work._get_gpu_work", lambda: BrokenWork)
+
+    fake_hash = blake2b(b"fakeBlock", digest_size=32).hexdigest()
+
+    with pytest.raises(RuntimeError) as exc:
+        solve_work(fake_hash, difficulty="f"*16)
+
+    assert "doesn't meet the difficulty" in str(exc.value)
+
+
 def test_work_timeout():
     """
     Try solving a work with timeout and make sure it times out